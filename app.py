@@ -1,17 +1,22 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
-import networkx as nx
+from scipy.fft import rfft, rfftfreq, next_fast_len
 import time
+import os
+from concurrent.futures import ThreadPoolExecutor
 import base64
 import io
-from ecosystem_model import run_lotka_volterra, run_habitat_change_simulation
-from visualization import plot_population_trends, plot_ecological_network, plot_phase_space
+from ecosystem_model import (run_lotka_volterra, run_lotka_volterra_batch, run_habitat_change_simulation,
+                             run_habitat_change_sweep, warm_up_kernels)
+from visualization import (plot_population_trends, plot_ecological_network, plot_phase_space,
+                           plot_scenario_comparison, plot_population_correlation, plot_power_spectrum,
+                           plot_intensity_sweep)
 from preset_scenarios import get_preset_scenarios
-from utils import save_scenario, load_scenario, export_simulation_data, calculate_ecosystem_metrics
+from jit import NUMBA_AVAILABLE
+from utils import save_scenario, load_scenario, list_saved_scenarios, export_simulation_data, calculate_ecosystem_metrics
 
 # Set page configuration
 st.set_page_config(
@@ -20,6 +25,545 @@ st.set_page_config(
     layout="wide"
 )
 
+# Compile the simulation kernels once per server process so the first run
+# does not pay the JIT cost inside the spinner
+@st.cache_resource(show_spinner=False)
+def _warm_up_kernels():
+    warm_up_kernels()
+
+_warm_up_kernels()
+
+# Scenario fields in the order of the sidebar parameter tuple
+SCENARIO_KEYS = (
+    'prey_growth_rate', 'prey_death_rate',
+    'predator_death_rate', 'predator_growth_rate',
+    'initial_prey', 'initial_predator', 'time_span',
+    'env_change_type', 'env_change_start', 'env_change_intensity',
+    'enable_env_change'
+)
+
+# Cached simulation runs, keyed on the scalar model parameters so identical
+# scenarios return instantly instead of re-integrating the ODE system. Results
+# are kept as float32: populations need no more precision and every cache
+# entry, session-state copy and download moves half the bytes
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_lv(prey_growth_rate, prey_death_rate, predator_death_rate,
+               predator_growth_rate, initial_prey, initial_predator, time_span):
+    args = (prey_growth_rate, prey_death_rate, predator_death_rate,
+            predator_growth_rate, initial_prey, initial_predator, time_span)
+    # Presets are solved in the background at startup (see _precompute_presets)
+    precomputed = _precompute_presets().get(('lv', args))
+    if precomputed is not None:
+        times, prey, predator = precomputed[1].result()
+    else:
+        times, prey, predator = run_lotka_volterra(*args)
+    return times.astype(np.float32), prey.astype(np.float32), predator.astype(np.float32), []
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_habitat(prey_growth_rate, prey_death_rate, predator_death_rate,
+                    predator_growth_rate, initial_prey, initial_predator, time_span,
+                    env_change_type, env_change_start, env_change_intensity):
+    args = (prey_growth_rate, prey_death_rate, predator_death_rate,
+            predator_growth_rate, initial_prey, initial_predator, time_span,
+            env_change_type, env_change_start, env_change_intensity)
+    precomputed = _precompute_presets().get(('habitat', args))
+    if precomputed is not None:
+        times, prey, predator, events = precomputed[1].result()
+    else:
+        times, prey, predator, events = run_habitat_change_simulation(*args)
+    return times.astype(np.float32), prey.astype(np.float32), predator.astype(np.float32), events
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_sweep(prey_growth_rate, prey_death_rate, predator_death_rate,
+                  predator_growth_rate, initial_prey, initial_predator, time_span,
+                  env_change_type, env_change_start, intensities):
+    times, prey, predator = run_habitat_change_sweep(
+        prey_growth_rate, prey_death_rate,
+        predator_death_rate, predator_growth_rate,
+        initial_prey, initial_predator, time_span,
+        env_change_type, env_change_start, intensities
+    )
+    return times.astype(np.float32), prey.astype(np.float32), predator.astype(np.float32)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _results_to_csv(times, prey, predator):
+    return pd.DataFrame({
+        'Time': times,
+        'Prey': prey,
+        'Predator': predator
+    }).to_csv(index=False).encode()
+
+def _summarize(prey, predator, initial_prey, initial_predator):
+    # Final populations and their change from the initial values, shared by every tab
+    final_prey = float(prey[-1])
+    final_predator = float(predator[-1])
+    return {
+        'final_prey': final_prey,
+        'final_predator': final_predator,
+        'prey_delta': final_prey - initial_prey,
+        'predator_delta': final_predator - initial_predator,
+        'prey_change': (final_prey - initial_prey) / initial_prey * 100,
+        'predator_change': (final_predator - initial_predator) / initial_predator * 100
+    }
+
+def _moving_average(values, window):
+    # Trailing window mean, NaN until the first full window (like pandas rolling)
+    # in the dtype of the input, so float32 results stay float32
+    averaged = np.full(len(values), np.nan, dtype=values.dtype)
+    averaged[window - 1:] = np.convolve(values, np.ones(window, dtype=values.dtype) / window, mode='valid')
+    return averaged
+
+def _pct_change(values):
+    # Percent change from the previous sample, NaN for the first (like pandas pct_change)
+    change = np.empty(len(values), dtype=values.dtype)
+    change[0] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change[1:] = np.diff(values) / values[:-1] * 100
+    return change
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _analysis_to_csv(times, prey, predator):
+    prey = prey.astype(np.float64)
+    predator = predator.astype(np.float64)
+    
+    # Rolling statistics (moving averages)
+    window = min(50, len(times) // 5)  # 20% of time series or 50 points, whichever is smaller
+    
+    return pd.DataFrame({
+        'Time': times,
+        'Prey_Population': prey,
+        'Predator_Population': predator,
+        'Prey_MovingAvg': _moving_average(prey, window),
+        'Predator_MovingAvg': _moving_average(predator, window),
+        'Prey_PctChange': _pct_change(prey),
+        'Predator_PctChange': _pct_change(predator)
+    }).to_csv(index=False).encode()
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_metrics(prey, predator):
+    metrics = calculate_ecosystem_metrics(prey, predator)
+    
+    # Pre-formatted table for the "Detailed Statistics" expander
+    stats_df = pd.DataFrame({
+        "Metric": ["Mean", "Standard Deviation", "Minimum", "Maximum", "Final Value"],
+        "Prey": [
+            f"{metrics.prey_mean:.2f}", 
+            f"{metrics.prey_std:.2f}", 
+            f"{metrics.prey_min:.2f}", 
+            f"{metrics.prey_max:.2f}",
+            f"{metrics.final_prey:.2f}"
+        ],
+        "Predator": [
+            f"{metrics.predator_mean:.2f}", 
+            f"{metrics.predator_std:.2f}", 
+            f"{metrics.predator_min:.2f}", 
+            f"{metrics.predator_max:.2f}",
+            f"{metrics.final_predator:.2f}"
+        ]
+    })
+    
+    # Display strings for the stability metrics panel
+    metric_text = {
+        'ecosystem_stability': f"{metrics.ecosystem_stability:.2f}",
+        'prey_period': f"{metrics.prey_period:.1f}" if metrics.prey_period > 0 else "N/A",
+        'prey_cv': f"{metrics.prey_cv:.3f}",
+        'prey_peaks_count': f"{metrics.prey_peaks_count}",
+        'predator_cv': f"{metrics.predator_cv:.3f}",
+        'phase_difference': f"{metrics.phase_difference:.1f}" if metrics.phase_difference > 0 else "N/A"
+    }
+    return metrics, stats_df, metric_text
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cycle_analysis(prey):
+    # Detrend the data
+    prey_detrended = prey - np.mean(prey)
+    
+    # One FFT at a fast transform length, reused for the cycles and the spectrum
+    n = next_fast_len(len(prey_detrended))
+    amplitudes = np.abs(rfft(prey_detrended, n=n))
+    fft_freq = rfftfreq(n)
+    
+    # Periods of the non-DC bins only; the DC bin has no period and stays NaN
+    cycle_lengths = np.full_like(fft_freq, np.nan)
+    np.divide(1.0, fft_freq, out=cycle_lengths, where=fft_freq > 0)
+    
+    # Indices of the top 5 amplitudes, ordered by increasing amplitude
+    top = np.argpartition(amplitudes, -5)[-5:]
+    idx = top[np.argsort(amplitudes[top])]
+    
+    # Filter out the DC bin (NaN) and very large values
+    dominant_cycles = [c for c in cycle_lengths[idx] if c < len(prey)]
+    
+    # Only plot meaningful frequency range (exclude very low frequencies)
+    meaningful = (fft_freq > 0) & (fft_freq < 0.5)
+    return dominant_cycles, cycle_lengths[meaningful], amplitudes[meaningful]
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _line_chart_data(times, prey, predator):
+    return pd.DataFrame(
+        {'Prey': prey, 'Predator': predator},
+        index=pd.Index(times, name='Time')
+    )
+
+# Solve every preset in the background once per server process, so that
+# picking a preset and pressing Run is answered without waiting on the solver.
+# The workers only call the model functions; the cached wrappers above pick
+# up the results on the script thread, where a worker's exception is raised.
+# odeint is not thread-safe, so every odeint solve (the habitat presets, and
+# the basic ones when there is no Numba for RK4) runs one after another on a
+# single worker; only the compiled RK4 runs share the thread pool
+@st.cache_resource(show_spinner=False)
+def _precompute_presets():
+    rk4_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+    odeint_executor = ThreadPoolExecutor(max_workers=1)
+    futures = {}
+    for name, scenario in get_preset_scenarios().items():
+        args = (
+            scenario['prey_growth_rate'], scenario['prey_death_rate'],
+            scenario['predator_death_rate'], scenario['predator_growth_rate'],
+            scenario['initial_prey'], scenario['initial_predator'], scenario['time_span']
+        )
+        if scenario['enable_env_change']:
+            args += (scenario['env_change_type'], scenario['env_change_start'], scenario['env_change_intensity'])
+            futures[('habitat', args)] = (name, odeint_executor.submit(run_habitat_change_simulation, *args))
+        else:
+            executor = rk4_executor if NUMBA_AVAILABLE else odeint_executor
+            futures[('lv', args)] = (name, executor.submit(run_lotka_volterra, *args))
+    rk4_executor.shutdown(wait=False)
+    odeint_executor.shutdown(wait=False)
+    return futures
+
+# Report presets whose background solve failed, even if nobody has picked them
+for _name, _future in _precompute_presets().values():
+    if _future.done() and _future.exception() is not None:
+        st.sidebar.warning(f"Could not precompute the {_name} preset: {_future.exception()}")
+
+# Cached figures - Figure objects are not picklable, so they live in
+# st.cache_resource and are built once per unique simulation result
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _fig_line_plotly(times, prey, predator, events):
+    return plot_population_trends(times, prey, predator, events, plot_type='plotly', max_points=2000)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _fig_phase(prey, predator):
+    return plot_phase_space(prey, predator, plot_type='plotly')
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _fig_sweep(times, prey, predator, intensities):
+    return plot_intensity_sweep(times, prey, predator, intensities)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _fig_correlation(prey, predator):
+    return plot_population_correlation(prey, predator, plot_type='plotly')
+
+# matplotlib figures are not thread-safe, so sessions must not share one:
+# these are cached as rendered PNG bytes instead (same look as st.pyplot)
+def _figure_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+    return buffer.getvalue()
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _png_spectrum(cycle_lengths, amplitudes):
+    return _figure_png(plot_power_spectrum(cycle_lengths, amplitudes))
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _png_network(prey_growth_rate, prey_death_rate, predator_death_rate,
+                 predator_growth_rate, prey_pop, predator_pop):
+    return _figure_png(plot_ecological_network({
+        'prey_growth_rate': prey_growth_rate,
+        'prey_death_rate': prey_death_rate,
+        'predator_death_rate': predator_death_rate,
+        'predator_growth_rate': predator_growth_rate,
+        'prey_pop': prey_pop,
+        'predator_pop': predator_pop
+    }))
+
+# The results panel runs as a fragment: interacting with its own widgets (view
+# tabs, CSV download) reruns only this panel instead of the whole script
+@st.fragment
+def _render_results(plot_data):
+    # Describe the scenario that produced these results, not the live sidebar
+    scenario = plot_data['scenario']
+    enable_env_change = scenario['enable_env_change']
+    env_change_type = scenario['env_change_type']
+    env_change_start = scenario['env_change_start']
+    env_change_intensity = scenario['env_change_intensity']
+    
+    # Sidebar tweaks rerun the script without changing the results, so only
+    # look the chart objects up again when a different scenario was simulated
+    if plot_data['scenario_hash'] != st.session_state.last_render_hash:
+        st.session_state.rendered_views = {
+            'line': _line_chart_data(plot_data['times'], plot_data['prey'], plot_data['predator']),
+            'plotly': _fig_line_plotly(
+                plot_data['times'],
+                plot_data['prey'],
+                plot_data['predator'],
+                plot_data.get('events', [])
+            ),
+            'phase': _fig_phase(plot_data['prey'], plot_data['predator'])
+        }
+        st.session_state.last_render_hash = plot_data['scenario_hash']
+    rendered_views = st.session_state.rendered_views
+    
+    # Create tabs for different visualization types
+    view_tab1, view_tab2, view_tab3 = st.tabs(["Line Chart", "Interactive Plot", "Phase Space"])
+    
+    with view_tab1:
+        # Rendered client-side, so no server-side figure or PNG encode
+        st.line_chart(
+            rendered_views['line'],
+            x_label='Time',
+            y_label='Population',
+            color=['#0000ff', '#ff0000']
+        )
+        for event in plot_data.get('events', []):
+            st.caption(f"t = {event['time']}: {event['description']}")
+    
+    with view_tab2:
+        st.plotly_chart(rendered_views['plotly'], use_container_width=True)
+    
+    with view_tab3:
+        st.plotly_chart(rendered_views['phase'], use_container_width=True)
+        st.markdown("""
+        **Phase Space Interpretation:** 
+        
+        This diagram shows predator population (y-axis) versus prey population (x-axis). 
+        Each point represents the population state at a moment in time, with arrows showing the direction of change.
+        
+        - Circular patterns indicate cyclical population dynamics
+        - Spirals inward suggest stability over time
+        - Spirals outward suggest instability
+        - The starting point is marked in green, and the ending point in red
+        """)
+    
+    # Export functionality
+    st.download_button(
+        label="📊 Export Simulation Data (CSV)",
+        data=_results_to_csv(plot_data['times'], plot_data['prey'], plot_data['predator']),
+        file_name="ecosystem_simulation_data.csv",
+        mime="text/csv",
+    )
+    
+    # Display final population stats
+    st.subheader("Final Population Statistics")
+    summary = plot_data['summary']
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(
+            "Prey Population", 
+            f"{summary['final_prey']:.1f}",
+            f"{summary['prey_delta']:.1f}"
+        )
+    
+    with col2:
+        st.metric(
+            "Predator Population", 
+            f"{summary['final_predator']:.1f}",
+            f"{summary['predator_delta']:.1f}"
+        )
+    
+    # Display interpretation
+    prey_change = summary['prey_change']
+    predator_change = summary['predator_change']
+    
+    st.subheader("Ecological Interpretation")
+    
+    if abs(prey_change) < 10 and abs(predator_change) < 10:
+        st.success("The ecosystem appears to be relatively stable, with population levels showing only minor fluctuations.")
+    elif prey_change > 50 and predator_change < -30:
+        st.warning("The prey population is growing rapidly while predators are declining, suggesting a potential imbalance in the ecosystem.")
+    elif prey_change < -50 and predator_change > 0:
+        st.error("The prey population has crashed significantly, which may eventually lead to predator decline due to food scarcity.")
+    elif prey_change < -30 and predator_change < -30:
+        st.error("Both populations are declining significantly, indicating a potentially endangered ecosystem.")
+    else:
+        st.info("The ecosystem shows typical predator-prey population cycles.")
+    
+    if enable_env_change:
+        st.markdown(f"**Environmental Change Effects:** The {env_change_type.lower()} that occurred at time {env_change_start} with {env_change_intensity}% intensity has affected the population dynamics.")
+    
+    # Population Stability Metrics section
+    st.subheader("Population Stability Metrics")
+    metric_text = plot_data['metric_text']
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Ecosystem Stability Score", metric_text['ecosystem_stability'], 
+                 help="Higher values indicate a more stable ecosystem (lower coefficient of variation)")
+        st.metric("Prey Oscillation Period", metric_text['prey_period'],
+                 help="Average time between prey population peaks")
+    
+    with col2:
+        st.metric("Prey Coefficient of Variation", metric_text['prey_cv'],
+                help="Measure of prey population variability (lower is more stable)")
+        st.metric("Prey Population Peaks", metric_text['prey_peaks_count'],
+                help="Number of prey population peaks detected")
+    
+    with col3:
+        st.metric("Predator Coefficient of Variation", metric_text['predator_cv'],
+                help="Measure of predator population variability (lower is more stable)")
+        st.metric("Phase Difference", metric_text['phase_difference'],
+                help="Time lag between prey and predator peaks")
+    
+    # Expandable detailed statistics
+    with st.expander("Detailed Statistics"):
+        st.markdown("### Raw Population Statistics")
+        st.table(plot_data['stats_df'])
+
+# The network and analysis tabs are fragments as well, so their own widgets
+# (the analysis download) rerun only that tab
+@st.fragment
+def _render_network_tab(network_data):
+    st.subheader("Ecological Network Visualization")
+    
+    if network_data is not None:
+        # Populations are rounded to 3 significant figures (node sizes only use
+        # their ratio) so near-identical runs share one cached image
+        network_png = _png_network(
+            network_data['prey_growth_rate'],
+            network_data['prey_death_rate'],
+            network_data['predator_death_rate'],
+            network_data['predator_growth_rate'],
+            float(f"{network_data['prey_pop']:.3g}"),
+            float(f"{network_data['predator_pop']:.3g}")
+        )
+        st.image(network_png, use_container_width=True)
+        
+        st.markdown("""
+        **Network Interpretation:**
+        
+        This diagram represents the ecological relationships in the simulated ecosystem:
+        - Arrows indicate the direction of energy/resource flow
+        - Arrow thickness represents the strength of the interaction
+        - Node size corresponds to population size
+        
+        The predator-prey relationship is the primary interaction shown, but the model also 
+        implicitly represents other factors like resource availability and competition.
+        """)
+    else:
+        st.info("Run a simulation first to visualize the ecological network.")
+
+@st.fragment
+def _render_analysis_tab(plot_data):
+    st.subheader("Data Analysis & Insights")
+    
+    if plot_data is None:
+        st.info("Run a simulation first to see data analysis.")
+    else:
+        # Advanced metrics, computed once when the simulation ran
+        metrics = plot_data['metrics']
+        
+        # Create two columns
+        col1, col2 = st.columns([1, 1])
+        
+        with col1:
+            # Correlation Analysis
+            st.subheader("Population Correlation Analysis")
+            
+            prey_pop = plot_data['prey']
+            predator_pop = plot_data['predator']
+            
+            # Calculate correlation coefficient
+            correlation = np.corrcoef(prey_pop, predator_pop)[0, 1]
+            
+            # Display correlation with explanation
+            st.metric("Correlation Coefficient", f"{correlation:.3f}")
+            
+            if correlation > 0.7:
+                st.success("Strong positive correlation: Predator and prey populations tend to increase and decrease together.")
+            elif correlation > 0.3:
+                st.info("Moderate positive correlation: Some synchronization between populations.")
+            elif correlation > -0.3:
+                st.info("Weak correlation: Populations not strongly related in their movements.")
+            elif correlation > -0.7:
+                st.warning("Moderate negative correlation: When one population increases, the other tends to decrease.")
+            else:
+                st.error("Strong negative correlation: Clear predator-prey cycles with inverse movements.")
+            
+            # Scatter plot with regression line
+            st.plotly_chart(_fig_correlation(prey_pop, predator_pop), use_container_width=True)
+        
+        with col2:
+            # FFT Analysis to find dominant cycle frequencies
+            st.subheader("Cycle Analysis")
+            
+            # Dominant frequencies and power spectrum of the detrended prey series
+            dominant_cycles, cycle_lengths, amplitudes = _cycle_analysis(prey_pop)
+            
+            if dominant_cycles:
+                main_cycle = np.mean(dominant_cycles[:2]) if len(dominant_cycles) >= 2 else dominant_cycles[0]
+                st.metric("Dominant Cycle Length", f"{main_cycle:.1f} time units")
+                
+                # Plot power spectrum
+                st.image(_png_spectrum(cycle_lengths, amplitudes), use_container_width=True)
+            else:
+                st.info("No clear cyclical patterns detected.")
+        
+        # System stability analysis
+        st.subheader("Ecosystem Stability Analysis")
+        
+        # Create columns for stability metrics
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            # Overall stability score
+            stability_score = metrics.ecosystem_stability
+            if np.isinf(stability_score):
+                stability_score = 10.0  # Cap at a reasonable maximum
+            
+            st.metric("Overall Stability", f"{min(stability_score, 10):.2f}/10")
+            
+            # Stability classification
+            if stability_score > 5:
+                st.success("Highly stable ecosystem")
+            elif stability_score > 2:
+                st.info("Moderately stable ecosystem")
+            else:
+                st.warning("Unstable ecosystem")
+        
+        with col2:
+            # Prey variation
+            st.metric("Prey Stability", f"{(1 - min(metrics.prey_cv, 1)) * 10:.1f}/10", 
+                    help="Higher values indicate more stable prey population")
+            
+            # Phase space classification
+            if metrics.prey_peaks_count > 0:
+                st.metric("Cycling Behavior", f"{metrics.prey_peaks_count} cycles detected")
+            else:
+                st.metric("Cycling Behavior", "No cycles detected")
+        
+        with col3:
+            # Predator variation
+            st.metric("Predator Stability", f"{(1 - min(metrics.predator_cv, 1)) * 10:.1f}/10",
+                    help="Higher values indicate more stable predator population")
+            
+            # Trend analysis
+            prey_trend = plot_data['summary']['prey_change']
+            predator_trend = plot_data['summary']['predator_change']
+            
+            if abs(prey_trend) < 10 and abs(predator_trend) < 10:
+                st.info("Populations remain near initial values")
+            elif prey_trend > 0 and predator_trend > 0:
+                st.success("Both populations growing")
+            elif prey_trend < 0 and predator_trend < 0:
+                st.error("Both populations declining")
+            elif prey_trend > 0 and predator_trend < 0:
+                st.warning("Prey growing, predators declining")
+            else:
+                st.warning("Prey declining, predators growing")
+        
+        # Export options
+        st.subheader("Export Analysis")
+        
+        # Offer CSV download of the series with moving averages and relative changes
+        st.download_button(
+            label="📊 Download Full Analysis (CSV)",
+            data=_analysis_to_csv(plot_data['times'], prey_pop, predator_pop),
+            file_name="ecosystem_analysis_data.csv",
+            mime="text/csv"
+        )
+
 # Initialize session state variables if they don't exist
 if 'simulation_results' not in st.session_state:
     st.session_state.simulation_results = None
@@ -27,8 +571,10 @@ if 'network_data' not in st.session_state:
     st.session_state.network_data = None
 if 'current_scenario' not in st.session_state:
     st.session_state.current_scenario = {}
-if 'saved_scenarios' not in st.session_state:
-    st.session_state.saved_scenarios = {}
+if 'last_render_hash' not in st.session_state:
+    st.session_state.last_render_hash = None
+if 'sweep_results' not in st.session_state:
+    st.session_state.sweep_results = None
 
 # Title and Introduction
 st.title("🌿 Virtual Ecosystem Simulator")
@@ -52,10 +598,13 @@ with tab1:
         ["Custom"] + list(preset_scenarios.keys())
     )
     
-    # Load preset if selected
+    # Load preset if selected. The read-only preset is referenced directly: it
+    # only seeds the widget defaults, and the parameter sync below replaces it
+    # with a fresh dict once the stored hash is cleared
     if preset_option != "Custom" and preset_option != st.session_state.get('last_preset', None):
-        st.session_state.current_scenario = preset_scenarios[preset_option].copy()
+        st.session_state.current_scenario = preset_scenarios[preset_option]
         st.session_state.last_preset = preset_option
+        st.session_state.pop('_scn_hash', None)
     
     # Species Parameters Section
     st.sidebar.subheader("Species Parameters")
@@ -118,6 +667,7 @@ with tab1:
         env_change_start = 0
         env_change_intensity = 0
         env_change_type = "None"
+        sweep_intensities = []
         
         if enable_env_change:
             env_change_type = st.selectbox(
@@ -140,21 +690,30 @@ with tab1:
                 st.session_state.current_scenario.get('env_change_intensity', 30),
                 help="Severity of the environmental change"
             )
+            
+            sweep_intensities = st.multiselect(
+                "Intensity Sweep (%)",
+                list(range(0, 101, 10)),
+                help="Also simulate the change at each of these intensities, each solved on its own"
+            )
     
-    # Save current parameters to session state
-    st.session_state.current_scenario = {
-        'prey_growth_rate': prey_growth_rate,
-        'prey_death_rate': prey_death_rate,
-        'initial_prey': initial_prey,
-        'predator_death_rate': predator_death_rate,
-        'predator_growth_rate': predator_growth_rate,
-        'initial_predator': initial_predator,
-        'time_span': time_span,
-        'enable_env_change': enable_env_change,
-        'env_change_type': env_change_type if enable_env_change else "None",
-        'env_change_start': env_change_start if enable_env_change else 0,
-        'env_change_intensity': env_change_intensity if enable_env_change else 0
-    }
+    # Current parameters, ordered to match the cached simulation helpers so the
+    # tuple doubles as their arguments
+    params = (
+        prey_growth_rate, prey_death_rate,
+        predator_death_rate, predator_growth_rate,
+        initial_prey, initial_predator, time_span,
+        env_change_type if enable_env_change else "None",
+        env_change_start if enable_env_change else 0,
+        env_change_intensity if enable_env_change else 0,
+        enable_env_change
+    )
+    
+    # Save current parameters to session state, only rebuilding the dict when they changed
+    scenario_hash = hash(params)
+    if scenario_hash != st.session_state.get('_scn_hash'):
+        st.session_state.current_scenario = dict(zip(SCENARIO_KEYS, params))
+        st.session_state._scn_hash = scenario_hash
     
     # Save/Load scenario section
     st.sidebar.subheader("Save/Load Scenario")
@@ -167,11 +726,12 @@ with tab1:
             st.sidebar.success(f"Saved: {scenario_name}")
     
     with col2:
-        saved_scenarios = list(st.session_state.saved_scenarios.keys())
+        saved_scenarios = list_saved_scenarios()
         if saved_scenarios:
             load_option = st.selectbox("Load Scenario", ["Select..."] + saved_scenarios)
             if load_option != "Select..." and st.button("📂 Load"):
                 st.session_state.current_scenario = load_scenario(load_option)
+                st.session_state.pop('_scn_hash', None)
                 st.sidebar.success(f"Loaded: {load_option}")
                 st.rerun()
     
@@ -186,365 +746,101 @@ with tab1:
         with st.spinner("Simulating ecosystem..."):
             # If environmental changes are enabled, use habitat change simulation
             if enable_env_change:
-                times, results, events = run_habitat_change_simulation(
-                    prey_growth_rate, prey_death_rate, 
-                    predator_death_rate, predator_growth_rate,
-                    initial_prey, initial_predator, time_span,
-                    env_change_type, env_change_start, env_change_intensity
-                )
+                times, prey, predator, events = _cached_habitat(*params[:10])
             else:
                 # Run basic Lotka-Volterra model
-                times, results = run_lotka_volterra(
-                    prey_growth_rate, prey_death_rate, 
-                    predator_death_rate, predator_growth_rate,
-                    initial_prey, initial_predator, time_span
-                )
-                events = []
+                times, prey, predator, events = _cached_lv(*params[:7])
             
-            # Store results in session state
+            # Metrics are computed once here and read by every tab
+            metrics, stats_df, metric_text = _cached_metrics(prey, predator)
+            
+            # Store results in session state, tagged with the scenario that produced them
             st.session_state.simulation_results = {
                 'times': times,
-                'results': results,
-                'events': events
+                'prey': prey,
+                'predator': predator,
+                'events': events,
+                'metrics': metrics,
+                'stats_df': stats_df,
+                'metric_text': metric_text,
+                'summary': _summarize(prey, predator, initial_prey, initial_predator),
+                'scenario': dict(st.session_state.current_scenario),
+                'scenario_hash': scenario_hash
             }
             
+            # Intensity sweep, each intensity solved on its own
+            if enable_env_change and sweep_intensities:
+                intensities = tuple(sorted(sweep_intensities))
+                sweep_times, sweep_prey, sweep_predator = _cached_sweep(
+                    prey_growth_rate, prey_death_rate,
+                    predator_death_rate, predator_growth_rate,
+                    initial_prey, initial_predator, time_span,
+                    env_change_type, env_change_start, intensities
+                )
+                st.session_state.sweep_results = {
+                    'times': sweep_times,
+                    'prey': sweep_prey,
+                    'predator': sweep_predator,
+                    'intensities': intensities
+                }
+            else:
+                st.session_state.sweep_results = None
+            
             # Generate network data
             st.session_state.network_data = {
                 'prey_growth_rate': prey_growth_rate,
                 'prey_death_rate': prey_death_rate,
                 'predator_death_rate': predator_death_rate,
                 'predator_growth_rate': predator_growth_rate,
-                'prey_pop': results[-1, 0],
-                'predator_pop': results[-1, 1]
+                'prey_pop': prey[-1],
+                'predator_pop': predator[-1]
             }
     
     # Display simulation results if available
     if st.session_state.simulation_results is not None:
-        plot_data = st.session_state.simulation_results
-        
-        # Create tabs for different visualization types
-        view_tab1, view_tab2, view_tab3 = st.tabs(["Line Chart", "Interactive Plot", "Phase Space"])
-        
-        with view_tab1:
-            fig_line = plot_population_trends(
-                plot_data['times'], 
-                plot_data['results'], 
-                plot_data.get('events', []),
-                plot_type='matplotlib'
-            )
-            st.pyplot(fig_line)
-        
-        with view_tab2:
-            fig_plotly = plot_population_trends(
-                plot_data['times'], 
-                plot_data['results'], 
-                plot_data.get('events', []),
-                plot_type='plotly'
-            )
-            st.plotly_chart(fig_plotly, use_container_width=True)
-            
-        with view_tab3:
-            fig_phase = plot_phase_space(plot_data['results'])
-            st.pyplot(fig_phase)
-            st.markdown("""
-            **Phase Space Interpretation:** 
-            
-            This diagram shows predator population (y-axis) versus prey population (x-axis). 
-            Each point represents the population state at a moment in time, with arrows showing the direction of change.
-            
-            - Circular patterns indicate cyclical population dynamics
-            - Spirals inward suggest stability over time
-            - Spirals outward suggest instability
-            - The starting point is marked in green, and the ending point in red
-            """)
-        
-        # Export functionality
-        st.download_button(
-            label="📊 Export Simulation Data (CSV)",
-            data=pd.DataFrame({
-                'Time': plot_data['times'],
-                'Prey': plot_data['results'][:, 0],
-                'Predator': plot_data['results'][:, 1]
-            }).to_csv(index=False),
-            file_name="ecosystem_simulation_data.csv",
-            mime="text/csv",
-        )
-        
-        # Display final population stats
-        st.subheader("Final Population Statistics")
-        col1, col2 = st.columns(2)
-        with col1:
-            final_prey = plot_data['results'][-1, 0]
-            st.metric(
-                "Prey Population", 
-                f"{final_prey:.1f}",
-                f"{final_prey - initial_prey:.1f}"
-            )
-        
-        with col2:
-            final_predator = plot_data['results'][-1, 1]
-            st.metric(
-                "Predator Population", 
-                f"{final_predator:.1f}",
-                f"{final_predator - initial_predator:.1f}"
-            )
-        
-        # Display interpretation
-        prey_change = ((final_prey - initial_prey) / initial_prey) * 100
-        predator_change = ((final_predator - initial_predator) / initial_predator) * 100
-        
-        st.subheader("Ecological Interpretation")
-        
-        if abs(prey_change) < 10 and abs(predator_change) < 10:
-            st.success("The ecosystem appears to be relatively stable, with population levels showing only minor fluctuations.")
-        elif prey_change > 50 and predator_change < -30:
-            st.warning("The prey population is growing rapidly while predators are declining, suggesting a potential imbalance in the ecosystem.")
-        elif prey_change < -50 and predator_change > 0:
-            st.error("The prey population has crashed significantly, which may eventually lead to predator decline due to food scarcity.")
-        elif prey_change < -30 and predator_change < -30:
-            st.error("Both populations are declining significantly, indicating a potentially endangered ecosystem.")
-        else:
-            st.info("The ecosystem shows typical predator-prey population cycles.")
-        
-        if enable_env_change:
-            st.markdown(f"**Environmental Change Effects:** The {env_change_type.lower()} that occurred at time {env_change_start} with {env_change_intensity}% intensity has affected the population dynamics.")
-            
-        # Population Stability Metrics section
-        st.subheader("Population Stability Metrics")
-        metrics = calculate_ecosystem_metrics(plot_data['results'])
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Ecosystem Stability Score", f"{metrics['ecosystem_stability']:.2f}", 
-                     help="Higher values indicate a more stable ecosystem (lower coefficient of variation)")
-            st.metric("Prey Oscillation Period", f"{metrics['prey_period']:.1f}" if metrics['prey_period'] > 0 else "N/A",
-                     help="Average time between prey population peaks")
-        
-        with col2:
-            st.metric("Prey Coefficient of Variation", f"{metrics['prey_cv']:.3f}",
-                    help="Measure of prey population variability (lower is more stable)")
-            st.metric("Prey Population Peaks", f"{metrics['prey_peaks_count']}",
-                    help="Number of prey population peaks detected")
-        
-        with col3:
-            st.metric("Predator Coefficient of Variation", f"{metrics['predator_cv']:.3f}",
-                    help="Measure of predator population variability (lower is more stable)")
-            st.metric("Phase Difference", f"{metrics['phase_difference']:.1f}" if metrics['phase_difference'] > 0 else "N/A",
-                    help="Time lag between prey and predator peaks")
-        
-        # Expandable detailed statistics
-        with st.expander("Detailed Statistics"):
-            st.markdown("### Raw Population Statistics")
-            stats_df = pd.DataFrame({
-                "Metric": ["Mean", "Standard Deviation", "Minimum", "Maximum", "Final Value"],
-                "Prey": [
-                    f"{metrics['prey_mean']:.2f}", 
-                    f"{metrics['prey_std']:.2f}", 
-                    f"{metrics['prey_min']:.2f}", 
-                    f"{metrics['prey_max']:.2f}",
-                    f"{metrics['final_prey']:.2f}"
-                ],
-                "Predator": [
-                    f"{metrics['predator_mean']:.2f}", 
-                    f"{metrics['predator_std']:.2f}", 
-                    f"{metrics['predator_min']:.2f}", 
-                    f"{metrics['predator_max']:.2f}",
-                    f"{metrics['final_predator']:.2f}"
-                ]
-            })
-            st.table(stats_df)
+        _render_results(st.session_state.simulation_results)
     else:
         st.info("Click 'Run Simulation' to see the ecosystem dynamics.")
+    
+    if st.session_state.sweep_results is not None:
+        sweep = st.session_state.sweep_results
+        st.subheader("Intensity Sweep")
+        st.plotly_chart(
+            _fig_sweep(sweep['times'], sweep['prey'], sweep['predator'], sweep['intensities']),
+            use_container_width=True
+        )
+    
+    # Compare every saved scenario in a single batched run
+    if saved_scenarios:
+        with st.expander("Compare Saved Scenarios"):
+            st.caption(
+                "Runs all saved scenarios together over the current simulation time. "
+                "Environmental changes are not applied in the comparison."
+            )
+            if st.button("📈 Compare All"):
+                scenarios = [load_scenario(name) for name in saved_scenarios]
+                batch_params = np.array([
+                    [s['prey_growth_rate'], s['prey_death_rate'],
+                     s['predator_death_rate'], s['predator_growth_rate']]
+                    for s in scenarios
+                ])
+                batch_initial = np.array([[s['initial_prey'], s['initial_predator']] for s in scenarios])
+                batch_times, batch_prey, batch_predator = run_lotka_volterra_batch(
+                    batch_params, batch_initial, time_span
+                )
+                # Solved in float64, plotted in float32 like the single runs
+                batch_prey = batch_prey.astype(np.float32)
+                batch_predator = batch_predator.astype(np.float32)
+                st.plotly_chart(
+                    plot_scenario_comparison(batch_times, batch_prey, batch_predator, saved_scenarios),
+                    use_container_width=True
+                )
 
 with tab2:
-    st.subheader("Ecological Network Visualization")
-    
-    if st.session_state.network_data is not None:
-        network_fig = plot_ecological_network(st.session_state.network_data)
-        st.pyplot(network_fig)
-        
-        st.markdown("""
-        **Network Interpretation:**
-        
-        This diagram represents the ecological relationships in the simulated ecosystem:
-        - Arrows indicate the direction of energy/resource flow
-        - Arrow thickness represents the strength of the interaction
-        - Node size corresponds to population size
-        
-        The predator-prey relationship is the primary interaction shown, but the model also 
-        implicitly represents other factors like resource availability and competition.
-        """)
-    else:
-        st.info("Run a simulation first to visualize the ecological network.")
+    _render_network_tab(st.session_state.network_data)
 
 with tab3:
-    st.subheader("Data Analysis & Insights")
-    
-    if st.session_state.simulation_results is None:
-        st.info("Run a simulation first to see data analysis.")
-    else:
-        plot_data = st.session_state.simulation_results
-        
-        # Calculate advanced metrics
-        metrics = calculate_ecosystem_metrics(plot_data['results'])
-        
-        # Create two columns
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            # Correlation Analysis
-            st.subheader("Population Correlation Analysis")
-            
-            prey_pop = plot_data['results'][:, 0]
-            predator_pop = plot_data['results'][:, 1]
-            
-            # Calculate correlation coefficient
-            correlation = np.corrcoef(prey_pop, predator_pop)[0, 1]
-            
-            # Display correlation with explanation
-            st.metric("Correlation Coefficient", f"{correlation:.3f}")
-            
-            if correlation > 0.7:
-                st.success("Strong positive correlation: Predator and prey populations tend to increase and decrease together.")
-            elif correlation > 0.3:
-                st.info("Moderate positive correlation: Some synchronization between populations.")
-            elif correlation > -0.3:
-                st.info("Weak correlation: Populations not strongly related in their movements.")
-            elif correlation > -0.7:
-                st.warning("Moderate negative correlation: When one population increases, the other tends to decrease.")
-            else:
-                st.error("Strong negative correlation: Clear predator-prey cycles with inverse movements.")
-                
-            # Scatter plot with regression line
-            fig, ax = plt.subplots(figsize=(8, 5))
-            ax.scatter(prey_pop, predator_pop, alpha=0.5, s=5)
-            
-            # Add regression line
-            m, b = np.polyfit(prey_pop, predator_pop, 1)
-            x_line = np.linspace(min(prey_pop), max(prey_pop), 100)
-            ax.plot(x_line, m * x_line + b, 'r-')
-            
-            ax.set_xlabel('Prey Population')
-            ax.set_ylabel('Predator Population')
-            ax.set_title('Predator vs Prey Population Correlation')
-            ax.grid(alpha=0.3)
-            st.pyplot(fig)
-        
-        with col2:
-            # FFT Analysis to find dominant cycle frequencies
-            st.subheader("Cycle Analysis")
-            
-            # Detrend the data
-            prey_detrended = prey_pop - np.mean(prey_pop)
-            
-            # Perform FFT
-            fft_values = np.fft.rfft(prey_detrended)
-            fft_freq = np.fft.rfftfreq(len(prey_detrended))
-            
-            # Get dominant frequencies
-            idx = np.argsort(np.abs(fft_values))[-5:]  # Get indices of top 5 amplitudes
-            dominant_cycles = 1 / fft_freq[idx]
-            
-            # Filter out infinity and very large values
-            dominant_cycles = [c for c in dominant_cycles if c != np.inf and c < len(prey_pop)]
-            
-            if dominant_cycles:
-                main_cycle = np.mean(dominant_cycles[:2]) if len(dominant_cycles) >= 2 else dominant_cycles[0]
-                st.metric("Dominant Cycle Length", f"{main_cycle:.1f} time units")
-                
-                # Plot power spectrum
-                fig, ax = plt.subplots(figsize=(8, 5))
-                # Only plot meaningful frequency range (exclude very low frequencies)
-                meaningful_idx = np.where((fft_freq > 0) & (fft_freq < 0.5))
-                ax.plot(1/fft_freq[meaningful_idx], np.abs(fft_values[meaningful_idx]))
-                ax.set_xlabel('Cycle Length (time units)')
-                ax.set_ylabel('Amplitude')
-                ax.set_title('Power Spectrum - Dominant Cycles')
-                st.pyplot(fig)
-            else:
-                st.info("No clear cyclical patterns detected.")
-
-        # System stability analysis
-        st.subheader("Ecosystem Stability Analysis")
-        
-        # Create columns for stability metrics
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            # Overall stability score
-            stability_score = metrics['ecosystem_stability']
-            if np.isinf(stability_score):
-                stability_score = 10.0  # Cap at a reasonable maximum
-                
-            st.metric("Overall Stability", f"{min(stability_score, 10):.2f}/10")
-            
-            # Stability classification
-            if stability_score > 5:
-                st.success("Highly stable ecosystem")
-            elif stability_score > 2:
-                st.info("Moderately stable ecosystem")
-            else:
-                st.warning("Unstable ecosystem")
-                
-        with col2:
-            # Prey variation
-            st.metric("Prey Stability", f"{(1 - min(metrics['prey_cv'], 1)) * 10:.1f}/10", 
-                    help="Higher values indicate more stable prey population")
-            
-            # Phase space classification
-            if metrics['prey_peaks_count'] > 0:
-                st.metric("Cycling Behavior", f"{metrics['prey_peaks_count']} cycles detected")
-            else:
-                st.metric("Cycling Behavior", "No cycles detected")
-                
-        with col3:
-            # Predator variation
-            st.metric("Predator Stability", f"{(1 - min(metrics['predator_cv'], 1)) * 10:.1f}/10",
-                    help="Higher values indicate more stable predator population")
-            
-            # Trend analysis
-            prey_trend = (metrics['final_prey'] - prey_pop[0]) / prey_pop[0] * 100
-            predator_trend = (metrics['final_predator'] - predator_pop[0]) / predator_pop[0] * 100
-            
-            if abs(prey_trend) < 10 and abs(predator_trend) < 10:
-                st.info("Populations remain near initial values")
-            elif prey_trend > 0 and predator_trend > 0:
-                st.success("Both populations growing")
-            elif prey_trend < 0 and predator_trend < 0:
-                st.error("Both populations declining")
-            elif prey_trend > 0 and predator_trend < 0:
-                st.warning("Prey growing, predators declining")
-            else:
-                st.warning("Prey declining, predators growing")
-                
-        # Export options
-        st.subheader("Export Analysis")
-        
-        # Create a comprehensive DataFrame
-        times = plot_data['times']
-        analysis_df = pd.DataFrame({
-            'Time': times,
-            'Prey_Population': prey_pop,
-            'Predator_Population': predator_pop
-        })
-        
-        # Add rolling statistics (moving averages)
-        window = min(50, len(times) // 5)  # 20% of time series or 50 points, whichever is smaller
-        analysis_df['Prey_MovingAvg'] = analysis_df['Prey_Population'].rolling(window=window).mean()
-        analysis_df['Predator_MovingAvg'] = analysis_df['Predator_Population'].rolling(window=window).mean()
-        
-        # Add relative change columns
-        analysis_df['Prey_PctChange'] = analysis_df['Prey_Population'].pct_change() * 100
-        analysis_df['Predator_PctChange'] = analysis_df['Predator_Population'].pct_change() * 100
-        
-        # Offer CSV download
-        csv_data = analysis_df.to_csv(index=False)
-        st.download_button(
-            label="📊 Download Full Analysis (CSV)",
-            data=csv_data,
-            file_name="ecosystem_analysis_data.csv",
-            mime="text/csv"
-        )
+    _render_analysis_tab(st.session_state.simulation_results)
 
 with tab4:
     st.subheader("Scenario Research & Species Information")
@@ -637,7 +933,8 @@ with tab4:
         
         # Add button to use this scenario
         if st.button(f"Use {selected_scenario} Preset"):
-            st.session_state.current_scenario = scenario.copy()
+            st.session_state.current_scenario = scenario
+            st.session_state.pop('_scn_hash', None)
             st.success(f"Loaded {selected_scenario}. Go to the Simulator tab to run the simulation!")
 
 with tab5:
@@ -0,0 +1,60 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Cython build of the Lotka-Volterra right-hand side and Jacobian, used by
+ecosystem_model in place of the plain Python kernels when Numba is not
+installed.
+
+Build it once, in place, with:
+
+    cythonize -i cy_kernels.pyx
+
+The resulting extension needs neither Cython nor a compiler at runtime.
+"""
+
+import numpy as np
+
+def lv_rhs(double t, const double[:] y, double alpha, double beta, double gamma,
+           double delta):
+    """
+    Lotka-Volterra right-hand side taking scalar parameters.
+
+    Args:
+        t: Time point (unused, required by the solver interface)
+        y: Current populations [prey, predator]
+        alpha, beta, gamma, delta: Model parameters
+
+    Returns:
+        ndarray: Derivatives [dPrey/dt, dPredator/dt]
+    """
+    cdef double prey = y[0]
+    cdef double predator = y[1]
+
+    derivatives = np.empty(2)
+    cdef double[::1] out = derivatives
+    out[0] = alpha * prey - beta * prey * predator
+    out[1] = delta * prey * predator - gamma * predator
+    return derivatives
+
+def lv_jac(double t, const double[:] y, double alpha, double beta, double gamma,
+           double delta):
+    """
+    Analytic Jacobian of the Lotka-Volterra system.
+
+    Args:
+        t: Time point (unused, required by the solver interface)
+        y: Current populations [prey, predator]
+        alpha, beta, gamma, delta: Model parameters
+
+    Returns:
+        ndarray: 2x2 matrix of partial derivatives
+    """
+    cdef double prey = y[0]
+    cdef double predator = y[1]
+
+    jacobian = np.empty((2, 2))
+    cdef double[:, ::1] out = jacobian
+    out[0, 0] = alpha - beta * predator
+    out[0, 1] = -beta * prey
+    out[1, 0] = delta * predator
+    out[1, 1] = delta * prey - gamma
+    return jacobian
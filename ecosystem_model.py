@@ -1,7 +1,215 @@
+import functools
+from collections import namedtuple
+from enum import IntEnum
 import numpy as np
-from scipy.integrate import solve_ivp
+from scipy.integrate import solve_ivp, odeint
 import random
-import matplotlib.pyplot as plt
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from jit import njit, prange, NUMBA_AVAILABLE
+
+try:
+    # Optional LSODA integrator driven by a compiled C callback, so no Python
+    # code runs per RHS evaluation (method='numbalsoda')
+    from numba import cfunc, carray
+    from numbalsoda import lsoda, lsoda_sig
+    
+    @cfunc(lsoda_sig, cache=True)
+    def _lv_rhs_cfunc(t, y, dy, data):
+        # data carries alpha, beta, gamma, delta
+        p = carray(data, (4,))
+        dy[0] = p[0] * y[0] - p[1] * y[0] * y[1]
+        dy[1] = p[3] * y[0] * y[1] - p[2] * y[1]
+    
+    _LV_RHS_CFUNC_ADDRESS = _lv_rhs_cfunc.address
+    NUMBALSODA_AVAILABLE = True
+except ImportError:
+    NUMBALSODA_AVAILABLE = False
+
+@njit(cache=True)
+def _lv_rhs(t, y, alpha, beta, gamma, delta):
+    """
+    Compiled Lotka-Volterra right-hand side taking scalar parameters.
+    
+    Args:
+        t: Time point (unused, required by the solver interface)
+        y: Current populations [prey, predator]
+        alpha, beta, gamma, delta: Model parameters (see lotka_volterra_system)
+        
+    Returns:
+        ndarray: Derivatives [dPrey/dt, dPredator/dt]
+    """
+    prey = y[0]
+    predator = y[1]
+    return np.array([alpha * prey - beta * prey * predator,
+                     delta * prey * predator - gamma * predator])
+
+@njit(cache=True)
+def _lv_jac(t, y, alpha, beta, gamma, delta):
+    """
+    Compiled analytic Jacobian of the Lotka-Volterra system.
+    
+    Args:
+        t: Time point (unused, required by the solver interface)
+        y: Current populations [prey, predator]
+        alpha, beta, gamma, delta: Model parameters (see lotka_volterra_system)
+        
+    Returns:
+        ndarray: 2x2 matrix of partial derivatives
+    """
+    prey = y[0]
+    predator = y[1]
+    return np.array([[alpha - beta * predator, -beta * prey],
+                     [delta * predator, delta * prey - gamma]])
+
+if not NUMBA_AVAILABLE:
+    try:
+        # Without Numba the kernels above are plain Python; prefer the Cython
+        # build of the RHS and Jacobian (cythonize -i cy_kernels.pyx) if present.
+        from cy_kernels import lv_rhs as _lv_rhs, lv_jac as _lv_jac
+    except ImportError:
+        pass
+
+@njit(cache=True)
+def _lv_log_schedule_rhs(t, u, knot_times, knot_params):
+    """
+    Compiled right-hand side for the log-populations, driven by a
+    precomputed parameter schedule.
+    
+    With u = log(population) the Lotka-Volterra equations become
+    du0/dt = alpha - beta * exp(u1) and du1/dt = delta * exp(u0) - gamma.
+    Populations stay positive by construction, and the solver tolerances act
+    on relative errors, so deep troughs are resolved as accurately as peaks.
+    
+    Args:
+        t: Time point
+        u: Current log-populations [log prey, log predator]
+        knot_times: Increasing times at which the parameters are tabulated
+        knot_params: Array of shape (4, len(knot_times)) holding the
+            effective alpha, beta, gamma and delta at each knot (see
+            _effective_rates)
+            
+    Returns:
+        ndarray: Derivatives [dlogPrey/dt, dlogPredator/dt]
+    """
+    alpha = np.interp(t, knot_times, knot_params[0])
+    beta = np.interp(t, knot_times, knot_params[1])
+    gamma = np.interp(t, knot_times, knot_params[2])
+    delta = np.interp(t, knot_times, knot_params[3])
+    return np.array([alpha - beta * np.exp(u[1]),
+                     delta * np.exp(u[0]) - gamma])
+
+@njit(cache=True)
+def _lv_log_schedule_jac(t, u, knot_times, knot_params):
+    """
+    Compiled analytic Jacobian matching _lv_log_schedule_rhs.
+    
+    Returns:
+        ndarray: 2x2 matrix of partial derivatives
+    """
+    beta = np.interp(t, knot_times, knot_params[1])
+    delta = np.interp(t, knot_times, knot_params[3])
+    return np.array([[0.0, -beta * np.exp(u[1])],
+                     [delta * np.exp(u[0]), 0.0]])
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _rk4_lv(alpha, beta, gamma, delta, x0, y0, dt, n_samples, steps_per_sample):
+    """
+    Fixed-step fourth-order Runge-Kutta integration of the Lotka-Volterra
+    system, run entirely inside the compiled loop.
+    
+    Args:
+        alpha, beta, gamma, delta: Model parameters
+        x0, y0: Initial prey and predator populations
+        dt: Integration step size
+        n_samples: Number of output samples (including the initial state)
+        steps_per_sample: Integration steps between consecutive samples
+        
+    Returns:
+        ndarray: Array of shape (2, n_samples); row 0 holds prey and row 1
+            predator values, each contiguous in memory
+    """
+    out = np.empty((2, n_samples))
+    x = x0
+    y = y0
+    out[0, 0] = x
+    out[1, 0] = y
+    half_dt = 0.5 * dt
+    
+    for i in range(1, n_samples):
+        for _ in range(steps_per_sample):
+            k1x = alpha * x - beta * x * y
+            k1y = delta * x * y - gamma * y
+            
+            x2 = x + half_dt * k1x
+            y2 = y + half_dt * k1y
+            k2x = alpha * x2 - beta * x2 * y2
+            k2y = delta * x2 * y2 - gamma * y2
+            
+            x3 = x + half_dt * k2x
+            y3 = y + half_dt * k2y
+            k3x = alpha * x3 - beta * x3 * y3
+            k3y = delta * x3 * y3 - gamma * y3
+            
+            x4 = x + dt * k3x
+            y4 = y + dt * k3y
+            k4x = alpha * x4 - beta * x4 * y4
+            k4y = delta * x4 * y4 - gamma * y4
+            
+            x += dt / 6.0 * (k1x + 2.0 * k2x + 2.0 * k3x + k4x)
+            y += dt / 6.0 * (k1y + 2.0 * k2y + 2.0 * k3y + k4y)
+        
+        out[0, i] = x
+        out[1, i] = y
+    
+    return out
+
+@njit(cache=True, parallel=True)
+def _rk4_lv_batch(params, y0, dt, n_samples, steps_per_sample):
+    """
+    Integrate many independent Lotka-Volterra scenarios in parallel.
+    
+    Args:
+        params: Array of shape (K, 4) with alpha, beta, gamma, delta per scenario
+        y0: Array of shape (K, 2) with initial prey and predator populations
+        dt, n_samples, steps_per_sample: Step plan shared by all scenarios
+        
+    Returns:
+        ndarray: Array of shape (2, K, n_samples); out[0] and out[1] are
+            contiguous (K, n_samples) blocks of prey and predator populations
+    """
+    num_scenarios = params.shape[0]
+    out = np.empty((2, num_scenarios, n_samples))
+    for k in prange(num_scenarios):
+        out[:, k] = _rk4_lv(params[k, 0], params[k, 1], params[k, 2], params[k, 3],
+                         y0[k, 0], y0[k, 1], dt, n_samples, steps_per_sample)
+    return out
+
+def _rk4_step_plan(time_span, n_samples, max_dt=0.01):
+    """
+    Choose an RK4 step size no larger than max_dt that lands exactly on
+    every output sample of np.linspace(0, time_span, n_samples).
+    
+    Returns:
+        tuple: (dt, steps_per_sample)
+    """
+    sample_interval = time_span / (n_samples - 1)
+    steps_per_sample = max(1, int(np.ceil(sample_interval / max_dt)))
+    return sample_interval / steps_per_sample, steps_per_sample
+
+def warm_up_kernels():
+    """
+    Trigger compilation of the JIT kernels so the first simulation does not
+    pay the compile cost. A no-op apart from a few cheap calls when Numba is
+    not installed.
+    """
+    _lv_rhs(0.0, np.ones(2), 1.0, 1.0, 1.0, 1.0)
+    _lv_jac(0.0, np.ones(2), 1.0, 1.0, 1.0, 1.0)
+    _lv_log_schedule_rhs(0.0, np.ones(2), np.zeros(1), np.ones((4, 1)))
+    _lv_log_schedule_jac(0.0, np.ones(2), np.zeros(1), np.ones((4, 1)))
+    _rk4_lv(1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 0.01, 2, 1)
+    _rk4_lv_batch(np.ones((1, 4)), np.ones((1, 2)), 0.01, 2, 1)
 
 def lotka_volterra_system(t, y, params):
     """
@@ -17,21 +225,109 @@ def lotka_volterra_system(t, y, params):
             - delta: predator growth rate from predation
     
     Returns:
-        List of derivatives [dPrey/dt, dPredator/dt]
+        ndarray: Derivatives [dPrey/dt, dPredator/dt]
+    """
+    return _lv_rhs(t, np.asarray(y, dtype=np.float64),
+                   params['alpha'], params['beta'], params['gamma'], params['delta'])
+
+@functools.lru_cache(maxsize=None)
+def _jax_lv_solvers():
+    """
+    Build the JAX Lotka-Volterra solvers on first use (method='jax').
+    
+    JAX is optional and imported lazily. 64-bit mode is switched on because
+    prey troughs around 1e-23 are far below float32 resolution.
+    
+    Returns:
+        tuple: (solve, solve_batch) - jitted functions taking (y0, times,
+              params) for one scenario, and the same vectorized over the
+              leading axis of y0 and params
     """
-    prey, predator = y
-    alpha = params['alpha']
-    beta = params['beta']
-    gamma = params['gamma']
-    delta = params['delta']
+    import jax
+    import jax.numpy as jnp
+    from jax.experimental.ode import odeint as jax_odeint
+    
+    jax.config.update("jax_enable_x64", True)
     
-    dPrey_dt = alpha * prey - beta * prey * predator
-    dPredator_dt = delta * prey * predator - gamma * predator
+    def rhs(y, t, alpha, beta, gamma, delta):
+        prey = y[0]
+        predator = y[1]
+        return jnp.stack([alpha * prey - beta * prey * predator,
+                          delta * prey * predator - gamma * predator])
     
-    return [dPrey_dt, dPredator_dt]
+    def solve(y0, times, params):
+        # Same tolerances as the numbalsoda path
+        return jax_odeint(rhs, y0, times, params[0], params[1], params[2], params[3],
+                          rtol=1e-8, atol=1e-30)
+    
+    return jax.jit(solve), jax.jit(jax.vmap(solve, in_axes=(0, None, 0)))
+
+@functools.lru_cache(maxsize=64)
+def _solve_lotka_volterra(prey_growth_rate, prey_death_rate, predator_death_rate,
+                          predator_growth_rate, initial_prey, initial_predator, time_span,
+                          method, n_samples):
+    """
+    Solve a basic Lotka-Volterra system. Memoized on its (hashable) arguments;
+    see run_lotka_volterra for the public interface.
+    """
+    if method is None:
+        method = 'rk4' if NUMBA_AVAILABLE else 'odeint'
+    
+    # Set up parameters as plain floats so the compiled RHS is typed once
+    params = (
+        float(prey_growth_rate),
+        float(prey_death_rate),
+        float(predator_death_rate),
+        float(predator_growth_rate)
+    )
+    
+    # Initial conditions
+    y0 = [initial_prey, initial_predator]
+    
+    # Time points
+    t_span = (0, time_span)
+    t_eval = np.linspace(0, time_span, n_samples)
+    
+    if method == 'rk4':
+        dt, steps_per_sample = _rk4_step_plan(time_span, len(t_eval))
+        prey, predator = _rk4_lv(*params, float(initial_prey), float(initial_predator),
+                                 dt, len(t_eval), steps_per_sample)
+        return t_eval, prey, predator
+    
+    if method == 'jax':
+        solve, _ = _jax_lv_solvers()
+        usol = np.asarray(solve(np.array(y0, dtype=np.float64), t_eval, np.array(params)))
+        return t_eval, np.ascontiguousarray(usol[:, 0]), np.ascontiguousarray(usol[:, 1])
+    
+    if method == 'numbalsoda':
+        if not NUMBALSODA_AVAILABLE:
+            raise ImportError("method='numbalsoda' requires the numbalsoda package")
+        # Relative error control all the way down: prey can fall to ~1e-23
+        # and recover, which any practical absolute tolerance would skip past
+        usol, success = lsoda(
+            _LV_RHS_CFUNC_ADDRESS,
+            np.array(y0, dtype=np.float64),
+            t_eval,
+            data=np.array(params, dtype=np.float64),
+            rtol=1e-8,
+            atol=1e-30
+        )
+        if not success:
+            raise RuntimeError("numbalsoda LSODA integration failed")
+        return t_eval, np.ascontiguousarray(usol[:, 0]), np.ascontiguousarray(usol[:, 1])
+    
+    # odeint and the solve_ivp methods integrate the log-populations with a
+    # constant parameter schedule, as the environmental runs do. On the raw
+    # populations no practical tolerance follows the presets through their
+    # 1e-35 troughs: loose ones go negative, tight ones stall
+    schedule = (np.zeros(1), np.array(params)[:, np.newaxis])
+    log_prey, log_predator = _solve_log_schedule(np.log(np.asarray(y0, dtype=np.float64)),
+                                                 t_span, t_eval, schedule, method)
+    return t_eval, np.exp(log_prey), np.exp(log_predator)
 
 def run_lotka_volterra(prey_growth_rate, prey_death_rate, predator_death_rate, 
-                      predator_growth_rate, initial_prey, initial_predator, time_span):
+                      predator_growth_rate, initial_prey, initial_predator, time_span,
+                      method=None, n_samples=1000):
     """
     Run a basic Lotka-Volterra simulation.
     
@@ -43,120 +339,333 @@ def run_lotka_volterra(prey_growth_rate, prey_death_rate, predator_death_rate,
         initial_prey (float): Initial prey population
         initial_predator (float): Initial predator population
         time_span (int): Duration of simulation
+        method (str, optional): 'rk4' for the compiled fixed-step integrator,
+            'numbalsoda' for compiled LSODA (requires numbalsoda), 'jax' for
+            JAX's XLA-compiled odeint (requires jax), 'odeint' for scipy's
+            LSODA wrapper or any scipy solve_ivp method name; implicit methods
+            ('LSODA', 'BDF', 'Radau') are given the analytic Jacobian. odeint
+            and solve_ivp integrate the log-populations (see
+            _lv_log_schedule_rhs). Defaults to 'rk4' when Numba is installed
+            and 'odeint' otherwise.
+        n_samples (int): Number of evenly spaced output time points
         
     Returns:
-        tuple: (times, results) where times is an array of time points and
-              results is an array of population values for prey and predator
+        tuple: (times, prey, predator) - time points and the contiguous prey
+              and predator population arrays (read-only, as they may be
+              shared with other callers through the cache)
     """
-    # Set up parameters
-    params = {
-        'alpha': prey_growth_rate,
-        'beta': prey_death_rate,
-        'gamma': predator_death_rate,
-        'delta': predator_growth_rate
-    }
+    # Identical runs are answered from the cache; rounding keeps float noise
+    # from the widgets out of the key
+    times, prey, predator = _solve_lotka_volterra(
+        round(float(prey_growth_rate), 9), round(float(prey_death_rate), 9),
+        round(float(predator_death_rate), 9), round(float(predator_growth_rate), 9),
+        round(float(initial_prey), 9), round(float(initial_predator), 9),
+        round(float(time_span), 9), method, int(n_samples)
+    )
     
-    # Initial conditions
-    y0 = [initial_prey, initial_predator]
+    # Cached arrays are shared between callers, so hand them out read-only
+    for values in (times, prey, predator):
+        values.setflags(write=False)
     
-    # Time points
-    t_span = (0, time_span)
-    t_eval = np.linspace(0, time_span, 1000)
+    return times, prey, predator
+
+def run_lotka_volterra_batch(params, initial_populations, time_span, n_samples=1000,
+                             method=None):
+    """
+    Run several basic Lotka-Volterra scenarios over a shared time span.
     
-    # Solve the ODE system
-    solution = solve_ivp(
-        lambda t, y: lotka_volterra_system(t, y, params),
-        t_span,
-        y0,
-        method='RK45',
-        t_eval=t_eval
+    Args:
+        params (array): Array of shape (K, 4) holding prey growth rate, prey death
+            rate, predator death rate and predator growth rate for each scenario
+        initial_populations (array): Array of shape (K, 2) with the initial prey
+            and predator populations for each scenario
+        time_span (int): Duration of simulation
+        n_samples (int): Number of evenly spaced output time points
+        method (str, optional): 'jax' to solve every scenario in one vmapped
+            JAX odeint call (requires jax). By default the compiled parallel
+            RK4 kernel is used, or one run_lotka_volterra call per scenario
+            without Numba.
+        
+    Returns:
+        tuple: (times, prey, predator) where prey and predator are C-contiguous
+              arrays of shape (K, len(times))
+    """
+    params = np.ascontiguousarray(params, dtype=np.float64)
+    initial_populations = np.ascontiguousarray(initial_populations, dtype=np.float64)
+    if params.ndim != 2 or params.shape[1] != 4:
+        raise ValueError("Parameters must have shape (scenarios, 4)")
+    if initial_populations.shape != (params.shape[0], 2):
+        raise ValueError("Initial populations must have shape (scenarios, 2)")
+    
+    t_eval = np.linspace(0, time_span, n_samples)
+    
+    if method == 'jax':
+        _, solve_batch = _jax_lv_solvers()
+        results = np.asarray(solve_batch(initial_populations, t_eval, params))
+        return t_eval, np.ascontiguousarray(results[:, :, 0]), np.ascontiguousarray(results[:, :, 1])
+    
+    if not NUMBA_AVAILABLE:
+        # Without compiled kernels fall back to one adaptive solve per scenario
+        results = np.stack([
+            np.stack(run_lotka_volterra(*p, *y0, time_span, n_samples=n_samples)[1:])
+            for p, y0 in zip(params, initial_populations)
+        ], axis=1) if len(params) else np.empty((2, 0, len(t_eval)))
+        return t_eval, results[0], results[1]
+    
+    # Species-major layout, so each of prey and predator is one contiguous block
+    dt, steps_per_sample = _rk4_step_plan(time_span, len(t_eval))
+    results = _rk4_lv_batch(params, initial_populations, dt, len(t_eval), steps_per_sample)
+    return t_eval, results[0], results[1]
+
+def run_preset_batch(scenarios):
+    """
+    Run a collection of scenarios, batching the independent ones.
+    
+    Scenarios without an environmental change that share a time span are
+    integrated together as one batch (see run_lotka_volterra_batch); those
+    with a change each follow their own parameter schedule and are run
+    individually.
+    
+    Args:
+        scenarios (dict): Scenario dictionaries keyed by name, in the format
+            returned by get_preset_scenarios
+            
+    Returns:
+        dict: (times, prey, predator, events) for each scenario name
+    """
+    results = {}
+    groups = {}
+    for name, scenario in scenarios.items():
+        if scenario.get('enable_env_change', False):
+            results[name] = run_habitat_change_simulation(
+                scenario['prey_growth_rate'], scenario['prey_death_rate'],
+                scenario['predator_death_rate'], scenario['predator_growth_rate'],
+                scenario['initial_prey'], scenario['initial_predator'], scenario['time_span'],
+                scenario['env_change_type'], scenario['env_change_start'], scenario['env_change_intensity']
+            )
+        else:
+            groups.setdefault(scenario['time_span'], []).append(name)
+    
+    for time_span, names in groups.items():
+        params = np.array([
+            [scenarios[name]['prey_growth_rate'], scenarios[name]['prey_death_rate'],
+             scenarios[name]['predator_death_rate'], scenarios[name]['predator_growth_rate']]
+            for name in names
+        ])
+        initial_populations = np.array([
+            [scenarios[name]['initial_prey'], scenarios[name]['initial_predator']]
+            for name in names
+        ])
+        times, prey, predator = run_lotka_volterra_batch(params, initial_populations, time_span)
+        for k, name in enumerate(names):
+            results[name] = (times, prey[k], predator[k], [])
+    
+    # Report in the order the scenarios were given
+    return {name: results[name] for name in scenarios}
+
+def _run_scenario(scenario):
+    """
+    Run a single scenario dictionary (worker for run_scenarios_parallel).
+    
+    Returns:
+        tuple: (times, prey, predator, events)
+    """
+    args = (
+        scenario['prey_growth_rate'], scenario['prey_death_rate'],
+        scenario['predator_death_rate'], scenario['predator_growth_rate'],
+        scenario['initial_prey'], scenario['initial_predator'], scenario['time_span']
     )
+    if scenario.get('enable_env_change', False):
+        return run_habitat_change_simulation(
+            *args,
+            scenario['env_change_type'], scenario['env_change_start'], scenario['env_change_intensity']
+        )
+    return (*run_lotka_volterra(*args), [])
+
+def run_scenarios_parallel(scenarios, n_jobs=None):
+    """
+    Run independent scenarios in parallel worker processes.
+    
+    Every scenario is solved on its own, so the work spreads across cores
+    with no coordination beyond collecting the results.
+    
+    Args:
+        scenarios (dict): Scenario dictionaries keyed by name, in the format
+            returned by get_preset_scenarios
+        n_jobs (int, optional): Number of worker processes. Defaults to the
+            number of CPUs.
+            
+    Returns:
+        dict: (times, prey, predator, events) for each scenario name
+    """
+    names = list(scenarios)
+    max_workers = min(n_jobs or os.cpu_count() or 1, max(len(names), 1))
     
-    return solution.t, solution.y.T
+    # Plain dicts pickle cleanly whatever mapping type the caller used
+    payload = [dict(scenarios[name]) for name in names]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_run_scenario, payload))
+    
+    return dict(zip(names, results))
 
-def apply_environmental_change(base_params, env_type, intensity, affected_species):
+class EnvType(IntEnum):
+    """
+    Environmental change types, dispatched on as integers rather than strings.
+    """
+    TEMPERATURE_INCREASE = 0
+    HABITAT_LOSS = 1
+    RESOURCE_DEPLETION = 2
+    DISEASE = 3
+
+# Display names used by the app and the preset scenarios
+_ENV_TYPES = {
+    "Temperature Increase": EnvType.TEMPERATURE_INCREASE,
+    "Habitat Loss": EnvType.HABITAT_LOSS,
+    "Resource Depletion": EnvType.RESOURCE_DEPLETION,
+    "Disease": EnvType.DISEASE
+}
+
+# Model parameters with the direct (disease) mortality rate mu
+LVParams = namedtuple('LVParams', 'alpha beta gamma delta mu', defaults=(0.0,))
+
+def _apply_env_change(params, env_type, scale, affected_species):
     """
     Modify parameters based on environmental change.
     
     Args:
-        base_params (dict): Original model parameters
-        env_type (str): Type of environmental change
-        intensity (float): Intensity of change (0-100%)
+        params (LVParams): Original model parameters
+        env_type (EnvType): Type of environmental change (None for no change)
+        scale (float or array): Intensity of change as a fraction (0-1)
         affected_species (str): Which species is affected ('prey', 'predator', or 'both')
         
     Returns:
-        dict: Modified parameters
+        LVParams: Modified parameters
     """
-    # Make a copy of the original parameters
-    params = base_params.copy()
+    affects_prey = affected_species in ("prey", "both")
+    affects_predator = affected_species in ("predator", "both")
     
-    # Scale factor based on intensity (0-100%)
-    scale = intensity / 100.0
-    
-    if env_type == "Temperature Increase":
-        if affected_species in ["prey", "both"]:
+    if env_type == EnvType.TEMPERATURE_INCREASE:
+        if affects_prey:
             # Higher temperatures can increase metabolic rates but also stress
-            params['alpha'] = base_params['alpha'] * (1 - scale * 0.3)  # Reduced reproduction
-            params['beta'] = base_params['beta'] * (1 + scale * 0.2)    # Increased vulnerability
-            
-        if affected_species in ["predator", "both"]:
-            params['gamma'] = base_params['gamma'] * (1 + scale * 0.4)  # Increased death rate
-            params['delta'] = base_params['delta'] * (1 - scale * 0.1)  # Less efficient hunting
-            
-    elif env_type == "Habitat Loss":
-        if affected_species in ["prey", "both"]:
-            params['alpha'] = base_params['alpha'] * (1 - scale * 0.5)  # Less resources for reproduction
-            params['beta'] = base_params['beta'] * (1 + scale * 0.3)    # Easier to catch (less hiding places)
-            
-        if affected_species in ["predator", "both"]:
-            params['gamma'] = base_params['gamma'] * (1 + scale * 0.2)  # Increased competition
-            # Hunting efficiency might go up initially as prey has fewer hiding places
-            if scale < 0.5:
-                params['delta'] = base_params['delta'] * (1 + scale * 0.2)
-            else:
-                params['delta'] = base_params['delta'] * (1 - (scale-0.5) * 0.4)  # But eventually decline
-            
-    elif env_type == "Resource Depletion":
-        if affected_species in ["prey", "both"]:
-            params['alpha'] = base_params['alpha'] * (1 - scale * 0.7)  # Substantially reduced reproduction
-            
-        if affected_species in ["predator", "both"]:
+            params = params._replace(
+                alpha=params.alpha * (1 - scale * 0.3),  # Reduced reproduction
+                beta=params.beta * (1 + scale * 0.2)     # Increased vulnerability
+            )
+        
+        if affects_predator:
+            params = params._replace(
+                gamma=params.gamma * (1 + scale * 0.4),  # Increased death rate
+                delta=params.delta * (1 - scale * 0.1)   # Less efficient hunting
+            )
+    
+    elif env_type == EnvType.HABITAT_LOSS:
+        if affects_prey:
+            params = params._replace(
+                alpha=params.alpha * (1 - scale * 0.5),  # Less resources for reproduction
+                beta=params.beta * (1 + scale * 0.3)     # Easier to catch (less hiding places)
+            )
+        
+        if affects_predator:
+            params = params._replace(
+                gamma=params.gamma * (1 + scale * 0.2),  # Increased competition
+                # Hunting efficiency might go up initially as prey has fewer hiding places,
+                # but eventually declines (np.where keeps this valid for arrays of intensities)
+                delta=params.delta * np.where(scale < 0.5, 1 + scale * 0.2, 1 - (scale-0.5) * 0.4)
+            )
+    
+    elif env_type == EnvType.RESOURCE_DEPLETION:
+        if affects_prey:
+            params = params._replace(alpha=params.alpha * (1 - scale * 0.7))  # Substantially reduced reproduction
+        
+        if affects_predator:
             # Secondary effect on predators as prey becomes scarcer
-            params['delta'] = base_params['delta'] * (1 - scale * 0.3)  # Less energy from prey
-            
-    elif env_type == "Disease":
+            params = params._replace(delta=params.delta * (1 - scale * 0.3))  # Less energy from prey
+    
+    elif env_type == EnvType.DISEASE:
         if affected_species == "prey":
-            params['alpha'] = base_params['alpha'] * (1 - scale * 0.4)  # Reduced reproduction
-            # Add a direct mortality factor to prey
-            params['direct_mortality'] = base_params.get('direct_mortality', 0) + scale * 0.05
-            
+            params = params._replace(
+                alpha=params.alpha * (1 - scale * 0.4),  # Reduced reproduction
+                mu=params.mu + scale * 0.05              # Direct mortality factor
+            )
+        
         elif affected_species == "predator":
-            params['gamma'] = base_params['gamma'] * (1 + scale * 0.6)  # Increased death rate
-            
+            params = params._replace(gamma=params.gamma * (1 + scale * 0.6))  # Increased death rate
+        
         elif affected_species == "both":
-            params['alpha'] = base_params['alpha'] * (1 - scale * 0.3)
-            params['gamma'] = base_params['gamma'] * (1 + scale * 0.4)
-            params['direct_mortality'] = base_params.get('direct_mortality', 0) + scale * 0.03
+            params = params._replace(
+                alpha=params.alpha * (1 - scale * 0.3),
+                gamma=params.gamma * (1 + scale * 0.4),
+                mu=params.mu + scale * 0.03
+            )
     
     return params
 
-def lotka_volterra_with_env_change(t, y, base_params, env_changes):
+def _lv_params(params):
     """
-    Extended Lotka-Volterra system with environmental changes.
+    Convert a parameter dictionary to LVParams.
+    """
+    return LVParams(params['alpha'], params['beta'], params['gamma'], params['delta'],
+                    params.get('direct_mortality', 0.0))
+
+def _effective_rates(params):
+    """
+    Fold direct mortality into the growth and death rates, so the model
+    is the plain four-parameter Lotka-Volterra system.
+    
+    A mortality rate mu applied to both species is the same as lowering
+    the prey growth rate and raising the predator death rate by mu.
+    
+    Args:
+        params (LVParams): Model parameters
+        
+    Returns:
+        tuple: (alpha, beta, gamma, delta) with mu folded in
+    """
+    return (params.alpha - params.mu, params.beta, params.gamma + params.mu, params.delta)
+
+def apply_environmental_change(base_params, env_type, intensity, affected_species):
+    """
+    Modify parameters based on environmental change.
+    
+    Args:
+        base_params (dict): Original model parameters
+        env_type (str): Type of environmental change
+        intensity (float): Intensity of change (0-100%)
+        affected_species (str): Which species is affected ('prey', 'predator', or 'both')
+        
+    Returns:
+        dict: Modified parameters, with any direct mortality (from disease)
+              folded into alpha and gamma rather than kept as its own entry
+    """
+    changed = _apply_env_change(_lv_params(base_params), _ENV_TYPES.get(env_type),
+                                intensity / 100.0, affected_species)
+    
+    params = dict(base_params)
+    params.pop('direct_mortality', None)
+    params.update(zip(('alpha', 'beta', 'gamma', 'delta'), _effective_rates(changed)))
+    return params
+
+# Intensities (%) at which an environmental change's effect on the parameters
+# changes slope or jumps; between them every parameter is linear in the intensity
+_INTENSITY_KINKS = {
+    "Habitat Loss": (50.0,)
+}
+
+def _current_env_params(t, base_params, env_changes):
+    """
+    Parameters in effect at time t once all active environmental changes
+    have been applied.
     
     Args:
         t: Time point
-        y: Current populations [prey, predator]
         base_params: Dictionary with baseline parameters
         env_changes: List of environmental change events
         
     Returns:
-        List of derivatives [dPrey/dt, dPredator/dt]
+        LVParams: Modified parameters
     """
-    prey, predator = y
-    
     # Start with baseline parameters
-    current_params = base_params.copy()
+    current_params = _lv_params(base_params)
     
     # Apply all active environmental changes
     for change in env_changes:
@@ -169,32 +678,196 @@ def lotka_volterra_with_env_change(t, y, base_params, env_changes):
                 effective_intensity = change['intensity']
                 
             # Apply the change to parameters
-            current_params = apply_environmental_change(
+            current_params = _apply_env_change(
                 current_params, 
-                change['type'], 
-                effective_intensity, 
+                _ENV_TYPES.get(change['type']), 
+                effective_intensity / 100.0, 
                 change['affected_species']
             )
     
-    # Standard Lotka-Volterra equations
-    alpha = current_params['alpha']
-    beta = current_params['beta']
-    gamma = current_params['gamma']
-    delta = current_params['delta']
+    return current_params
+
+def _env_param_schedule(base_params, env_changes):
+    """
+    Tabulate the parameters of a set of environmental changes at the times
+    where they can change slope or jump.
+    
+    Each change ramps its intensity linearly over its duration, and every
+    parameter is piecewise linear in the intensity, so linear interpolation
+    between these knots reproduces _current_env_params exactly as long as the
+    ramps of different changes do not overlap. Outside the knots the
+    parameters are constant (np.interp clamps to the end values).
+    
+    Args:
+        base_params: Dictionary with baseline parameters
+        env_changes: List of environmental change events
+        
+    Returns:
+        tuple: (knot_times, knot_params) - increasing knot times and an array
+              of shape (4, len(knot_times)) holding the effective alpha,
+              beta, gamma and delta at each knot
+    """
+    knots = {0.0}
+    for change in env_changes:
+        start = float(change['start_time'])
+        duration = change.get('duration', 0)
+        
+        # A knot just before each breakpoint captures jumps, such as
+        # abrupt (zero-duration) changes
+        breakpoints = [start]
+        if duration > 0:
+            breakpoints.append(start + duration)
+            for kink in _INTENSITY_KINKS.get(change['type'], ()):
+                if change['intensity'] > kink:
+                    breakpoints.append(start + duration * kink / change['intensity'])
+        for t in breakpoints:
+            knots.update((np.nextafter(t, -np.inf), t))
+    
+    knot_times = np.array(sorted(knots))
+    knot_params = np.empty((4, len(knot_times)))
+    for i, t in enumerate(knot_times):
+        knot_params[:, i] = _effective_rates(_current_env_params(t, base_params, env_changes))
+    
+    return knot_times, knot_params
+
+def lotka_volterra_with_env_change(t, y, base_params, env_changes):
+    """
+    Extended Lotka-Volterra system with environmental changes.
+    
+    Args:
+        t: Time point
+        y: Current populations [prey, predator]
+        base_params: Dictionary with baseline parameters
+        env_changes: List of environmental change events
+        
+    Returns:
+        ndarray: Derivatives [dPrey/dt, dPredator/dt]
+    """
+    current_params = _current_env_params(t, base_params, env_changes)
+    
+    # Standard Lotka-Volterra equations, with any direct mortality from
+    # disease or other factors folded into the rates
+    return _lv_rhs(
+        t, np.asarray(y, dtype=np.float64),
+        *map(float, _effective_rates(current_params))
+    )
+
+def lotka_volterra_env_jacobian(t, y, base_params, env_changes):
+    """
+    Analytic Jacobian of lotka_volterra_with_env_change.
+    
+    Args:
+        t: Time point
+        y: Current populations [prey, predator]
+        base_params: Dictionary with baseline parameters
+        env_changes: List of environmental change events
+        
+    Returns:
+        ndarray: 2x2 matrix of partial derivatives
+    """
+    current_params = _current_env_params(t, base_params, env_changes)
+    return _lv_jac(
+        t, np.asarray(y, dtype=np.float64),
+        *map(float, _effective_rates(current_params))
+    )
+
+def _build_env_changes(env_change_type, env_change_start, env_change_intensity, rng=None):
+    """
+    Describe a single gradual environmental change event.
+    
+    Args:
+        env_change_type (str): Type of environmental change
+        env_change_start (int): When the change begins
+        env_change_intensity (float or array): Severity of change (0-100%)
+        rng (random.Random, optional): Source of randomness for choosing the
+            species a disease affects. Defaults to the global random module.
+        
+    Returns:
+        list: Environmental change events for lotka_volterra_with_env_change
+    """
+    affected_species = "both"  # Default to affecting both
+    
+    # Customize which species are affected based on the change type
+    if env_change_type == "Disease":
+        # Randomly choose which species is affected
+        affected_options = ["prey", "predator", "both"]
+        affected_species = (rng or random).choice(affected_options)
     
-    dPrey_dt = alpha * prey - beta * prey * predator
-    dPredator_dt = delta * prey * predator - gamma * predator
+    return [{
+        'type': env_change_type,
+        'start_time': env_change_start,
+        'intensity': env_change_intensity,
+        'affected_species': affected_species,
+        'duration': 10  # Gradual change over 10 time units
+    }]
+
+# Tolerances on the log-populations, i.e. on the relative error of the
+# populations. The presets pass through troughs far below 1e-15, and these
+# keep every preset within 1e-4 (in log) of a tight DOP853 reference
+_LOG_SOLVER_OPTIONS = {'rtol': 1e-10, 'atol': 1e-12}
+
+# odeint's LSODA keeps its state in Fortran common blocks and the RHS callback
+# can hand the GIL to another thread mid-solve, so solves must not overlap
+# (Streamlit runs each session on its own thread)
+_ODEINT_LOCK = threading.Lock()
+
+def _solve_log_schedule(u0, t_span, t_eval, schedule, method='odeint'):
+    """
+    Integrate the log-population system for one parameter schedule.
     
-    # Add any direct mortality from disease or other factors
-    if 'direct_mortality' in current_params:
-        dPrey_dt -= current_params['direct_mortality'] * prey
-        dPredator_dt -= current_params['direct_mortality'] * predator
+    Args:
+        u0 (array): Initial log-populations [log prey, log predator]
+        t_span (tuple): (start, end) of the integration
+        t_eval (array): Output time points
+        schedule (tuple): (knot_times, knot_params) from _env_param_schedule
+        method (str): 'odeint' or a scipy solve_ivp method name
         
-    return [dPrey_dt, dPredator_dt]
+    Returns:
+        tuple: (log_prey, log_predator) contiguous arrays at t_eval
+        
+    Raises:
+        RuntimeError: If the solver stops before the end of t_span
+    """
+    if method == 'odeint':
+        with _ODEINT_LOCK:
+            usol, info = odeint(
+                _lv_log_schedule_rhs,
+                u0,
+                t_eval,
+                args=schedule,
+                Dfun=_lv_log_schedule_jac,
+                tfirst=True,
+                full_output=True,
+                **_LOG_SOLVER_OPTIONS
+            )
+        if info['message'] != 'Integration successful.':
+            raise RuntimeError(f"odeint integration failed: {info['message']}")
+        return np.ascontiguousarray(usol[:, 0]), np.ascontiguousarray(usol[:, 1])
+    
+    # Implicit solvers take the analytic Jacobian; explicit ones have no use for it
+    solver_options = dict(_LOG_SOLVER_OPTIONS)
+    if method in ('LSODA', 'BDF', 'Radau'):
+        solver_options['jac'] = _lv_log_schedule_jac
+    
+    # Solve the ODE system (not vectorized, see _solve_lotka_volterra)
+    solution = solve_ivp(
+        _lv_log_schedule_rhs,
+        t_span,
+        u0,
+        method=method,
+        t_eval=t_eval,
+        args=schedule,
+        vectorized=False,
+        **solver_options
+    )
+    if not solution.success:
+        raise RuntimeError(f"{method} integration failed: {solution.message}")
+    return solution.y[0], solution.y[1]
 
 def run_habitat_change_simulation(prey_growth_rate, prey_death_rate, predator_death_rate, 
                                  predator_growth_rate, initial_prey, initial_predator, 
-                                 time_span, env_change_type, env_change_start, env_change_intensity):
+                                 time_span, env_change_type, env_change_start, env_change_intensity,
+                                 method='odeint', n_samples=1000, rng=None):
     """
     Run a Lotka-Volterra simulation with environmental changes.
     
@@ -209,10 +882,28 @@ def run_habitat_change_simulation(prey_growth_rate, prey_death_rate, predator_de
         env_change_type (str): Type of environmental change
         env_change_start (int): When the change begins
         env_change_intensity (float): Severity of change (0-100%)
+        method (str): 'odeint' for scipy's LSODA wrapper (fastest for this
+            small system) or any scipy solve_ivp method name. odeint and the
+            implicit methods ('LSODA', 'BDF', 'Radau') are given the analytic
+            Jacobian instead of estimating it by finite differences.
+        n_samples (int): Number of evenly spaced output time points
+        rng (random.Random, optional): Seeded generator for reproducible
+            disease runs (see _build_env_changes)
         
+    Populations are integrated as logarithms (see _lv_log_schedule_rhs), so
+    they stay positive and keep their relative accuracy through collapses.
+    
     Returns:
-        tuple: (times, results, events) - times, population results, and significant events
+        tuple: (times, prey, predator, events) - time points, contiguous prey and
+              predator population arrays, and significant events
+              
+    Raises:
+        ValueError: If an initial population is not positive
+        RuntimeError: If the solver fails
     """
+    if initial_prey <= 0 or initial_predator <= 0:
+        raise ValueError("Initial populations must be positive")
+    
     # Set up baseline parameters
     base_params = {
         'alpha': prey_growth_rate,
@@ -222,38 +913,22 @@ def run_habitat_change_simulation(prey_growth_rate, prey_death_rate, predator_de
     }
     
     # Define environmental change
-    affected_species = "both"  # Default to affecting both
+    env_changes = _build_env_changes(env_change_type, env_change_start, env_change_intensity, rng)
+    affected_species = env_changes[0]['affected_species']
     
-    # Customize which species are affected based on the change type
-    if env_change_type == "Disease":
-        # Randomly choose which species is affected
-        import random
-        affected_options = ["prey", "predator", "both"]
-        affected_species = random.choice(affected_options)
-    
-    env_changes = [{
-        'type': env_change_type,
-        'start_time': env_change_start,
-        'intensity': env_change_intensity,
-        'affected_species': affected_species,
-        'duration': 10  # Gradual change over 10 time units
-    }]
-    
-    # Initial conditions
-    y0 = [initial_prey, initial_predator]
+    # Initial conditions, as log-populations (see _lv_log_schedule_rhs)
+    u0 = np.log([float(initial_prey), float(initial_predator)])
     
     # Time points
     t_span = (0, time_span)
-    t_eval = np.linspace(0, time_span, 1000)
+    t_eval = np.linspace(0, time_span, n_samples)
     
-    # Solve the ODE system
-    solution = solve_ivp(
-        lambda t, y: lotka_volterra_with_env_change(t, y, base_params, env_changes),
-        t_span,
-        y0,
-        method='RK45',
-        t_eval=t_eval
-    )
+    # Parameters are tabulated once up front, so the compiled RHS only
+    # interpolates instead of re-applying the changes on every call
+    schedule = _env_param_schedule(base_params, env_changes)
+    
+    log_prey, log_predator = _solve_log_schedule(u0, t_span, t_eval, schedule, method)
+    times, prey, predator = t_eval, np.exp(log_prey), np.exp(log_predator)
     
     # Create events list for plotting
     events = [{
@@ -264,4 +939,71 @@ def run_habitat_change_simulation(prey_growth_rate, prey_death_rate, predator_de
         'affected': affected_species
     }]
     
-    return solution.t, solution.y.T, events
+    return times, prey, predator, events
+
+def run_habitat_change_sweep(prey_growth_rate, prey_death_rate, predator_death_rate,
+                             predator_growth_rate, initial_prey, initial_predator,
+                             time_span, env_change_type, env_change_start, intensities,
+                             method='odeint', n_samples=1000, rng=None):
+    """
+    Run one environmental change at several intensities.
+    
+    Each intensity is integrated on its own, exactly as
+    run_habitat_change_simulation would, so every row matches the
+    single-intensity run. (Packing the runs into one state vector would share
+    one error norm between them and let the largest trajectory set the step
+    size for all.) A disease affects the same species in every run.
+    
+    Args:
+        prey_growth_rate (float): Prey reproduction rate (alpha)
+        prey_death_rate (float): Prey death rate due to predation (beta)
+        predator_death_rate (float): Predator death rate (gamma)
+        predator_growth_rate (float): Predator growth rate from predation (delta)
+        initial_prey (float): Initial prey population
+        initial_predator (float): Initial predator population
+        time_span (int): Duration of simulation
+        env_change_type (str): Type of environmental change
+        env_change_start (int): When the change begins
+        intensities (list): Severities of change (0-100%), one per trajectory
+        method (str): 'odeint' or a scipy solve_ivp method name (see
+            run_habitat_change_simulation)
+        n_samples (int): Number of evenly spaced output time points
+        rng (random.Random, optional): Seeded generator for reproducible
+            disease runs (see _build_env_changes)
+        
+    Returns:
+        tuple: (times, prey, predator) where prey and predator are arrays of
+              shape (len(intensities), len(times))
+              
+    Raises:
+        ValueError: If an initial population is not positive
+        RuntimeError: If the solver fails for any intensity
+    """
+    if initial_prey <= 0 or initial_predator <= 0:
+        raise ValueError("Initial populations must be positive")
+    
+    intensities = np.asarray(intensities, dtype=np.float64)
+    
+    base_params = {
+        'alpha': prey_growth_rate,
+        'beta': prey_death_rate,
+        'gamma': predator_death_rate,
+        'delta': predator_growth_rate
+    }
+    
+    # Choose the affected species once, then vary only the intensity
+    change = _build_env_changes(env_change_type, env_change_start, intensities, rng)[0]
+    
+    u0 = np.log([float(initial_prey), float(initial_predator)])
+    t_span = (0, time_span)
+    t_eval = np.linspace(0, time_span, n_samples)
+    
+    prey = np.empty((len(intensities), n_samples))
+    predator = np.empty((len(intensities), n_samples))
+    for k, intensity in enumerate(intensities.tolist()):
+        schedule = _env_param_schedule(base_params, [dict(change, intensity=intensity)])
+        log_prey, log_predator = _solve_log_schedule(u0, t_span, t_eval, schedule, method)
+        prey[k] = np.exp(log_prey)
+        predator[k] = np.exp(log_predator)
+    
+    return t_eval, prey, predator
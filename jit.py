@@ -0,0 +1,30 @@
+"""
+Optional Numba support for the simulation kernels.
+
+Numba is not a required dependency. When it is installed the decorators
+below compile the numeric kernels to machine code; when it is missing they
+return the plain Python function unchanged so every kernel still works.
+"""
+
+try:
+    from numba import config, njit, prange
+    NUMBA_AVAILABLE = True
+    
+    # Prefer OpenMP for parallel kernels: the TBB pool, once used from a
+    # Streamlit script thread, keeps the interpreter from exiting.
+    config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """
+        No-op stand-in for numba.njit, usable with or without arguments.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        
+        def decorator(func):
+            return func
+        
+        return decorator
@@ -1,57 +1,150 @@
+import functools
 import numpy as np
 from scipy.integrate import solve_ivp
-import matplotlib.pyplot as plt
+from jit import njit, NUMBA_AVAILABLE
 
-def multi_species_system(t, y, params):
+@njit(cache=True, fastmath=True)
+def _multi_species_rhs(t, y, growth_rates, interaction_matrix, inv_carrying_capacities):
     """
-    Extended ecosystem model with multiple interacting species.
+    Compiled multi-species right-hand side taking the parameters as arrays.
     
     Args:
-        t: Time point
+        t: Time point (unused, required by the solver interface)
         y: Array of current population values for each species
-        params: Dictionary containing model parameters
-            - growth_rates: List of intrinsic growth rates for each species
-            - interaction_matrix: Matrix of interaction coefficients
-    
+        growth_rates: Array of intrinsic growth rates
+        interaction_matrix: Square array of interaction coefficients with a
+            zero diagonal (see _interaction_array)
+        inv_carrying_capacities: Array of reciprocal carrying capacities
+            (0 for unbounded growth, see _inverse_capacities)
+        
     Returns:
-        List of derivatives for each species population
+        ndarray: Derivatives for each species population
     """
+    # Fill a single preallocated result in one pass, rather than building
+    # the interaction vector and the growth term as separate temporaries
     num_species = len(y)
-    derivatives = np.zeros(num_species)
-    
-    # Get parameters
-    growth_rates = params['growth_rates']
-    interaction_matrix = params['interaction_matrix']
-    carrying_capacities = params.get('carrying_capacities', [float('inf')] * num_species)
+    derivatives = np.empty(num_species)
     
-    # Calculate derivative for each species
     for i in range(num_species):
-        # Intrinsic growth term (includes carrying capacity)
-        derivatives[i] = growth_rates[i] * y[i] * (1 - y[i] / carrying_capacities[i])
-        
         # Interaction terms with other species
+        interactions = 0.0
         for j in range(num_species):
-            if i != j:  # Skip self-interaction 
-                derivatives[i] += interaction_matrix[i][j] * y[i] * y[j]
+            interactions += interaction_matrix[i, j] * y[j]
+        
+        # Intrinsic growth term (includes carrying capacity)
+        derivatives[i] = growth_rates[i] * y[i] * (1 - y[i] * inv_carrying_capacities[i]) + y[i] * interactions
     
     return derivatives
 
-def run_multi_species_simulation(species_names, growth_rates, interaction_matrix, 
-                                initial_populations, carrying_capacities=None, time_span=100):
+if not NUMBA_AVAILABLE:
+    def _multi_species_rhs(t, y, growth_rates, interaction_matrix, inv_carrying_capacities):
+        """
+        NumPy right-hand side used without Numba, where the fused loop above
+        would run as interpreted Python on every solver step.
+        
+        Args:
+            See the compiled version above.
+            
+        Returns:
+            ndarray: Derivatives for each species population
+        """
+        # Interaction terms with other species as one matrix-vector product
+        interactions = interaction_matrix.dot(y)
+        
+        # Intrinsic growth term (includes carrying capacity)
+        return growth_rates * y * (1 - y * inv_carrying_capacities) + y * interactions
+
+@njit(cache=True)
+def _multi_species_jac(t, y, growth_rates, interaction_matrix, inv_carrying_capacities):
     """
-    Run a simulation with multiple interacting species.
+    Compiled analytic Jacobian of the multi-species system.
     
     Args:
-        species_names (list): Names of each species in the ecosystem
-        growth_rates (list): Intrinsic growth rates for each species
-        interaction_matrix (list): Matrix of interaction coefficients
-        initial_populations (list): Initial population for each species
-        carrying_capacities (list, optional): Maximum sustainable population for each species
-        time_span (int): Duration of simulation
+        t: Time point (unused, required by the solver interface)
+        y: Array of current population values for each species
+        growth_rates: Array of intrinsic growth rates
+        interaction_matrix: Square array of interaction coefficients with a
+            zero diagonal (see _interaction_array)
+        inv_carrying_capacities: Array of reciprocal carrying capacities
+            (0 for unbounded growth, see _inverse_capacities)
         
     Returns:
-        tuple: (times, results) where times is an array of time points and
-               results is an array of population values for all species
+        ndarray: Square matrix of partial derivatives
+    """
+    y = np.ascontiguousarray(y)
+    num_species = len(y)
+    interactions = interaction_matrix.dot(y)
+    
+    # Off-diagonal entries: d(dy_i/dt)/dy_j = M[i, j] * y[i]
+    jac = y.reshape((num_species, 1)) * interaction_matrix
+    
+    # Diagonal entries: logistic growth plus the interactions with every other species
+    for i in range(num_species):
+        jac[i, i] = growth_rates[i] * (1 - 2 * y[i] * inv_carrying_capacities[i]) + interactions[i]
+    
+    return jac
+
+def _interaction_array(interaction_matrix):
+    """
+    Copy an interaction matrix into a contiguous float64 array with the
+    diagonal zeroed, since the model ignores self-interaction.
+    
+    Args:
+        interaction_matrix (array-like): Square matrix of interaction coefficients
+        
+    Returns:
+        ndarray: Interaction matrix ready for the compiled kernels
+    """
+    interactions = np.array(interaction_matrix, dtype=np.float64, order='C')
+    np.fill_diagonal(interactions, 0.0)
+    return interactions
+
+def _inverse_capacities(carrying_capacities):
+    """
+    Reciprocals of the carrying capacities, so the kernels multiply rather
+    than divide on every call. An infinite capacity maps to 0, which leaves
+    that species' growth unbounded.
+    
+    Args:
+        carrying_capacities (array-like): Carrying capacity of each species
+        
+    Returns:
+        ndarray: float64 array of 1 / carrying capacity
+    """
+    return 1.0 / np.asarray(carrying_capacities, dtype=np.float64)
+
+def multi_species_system(t, y, params):
+    """
+    Extended ecosystem model with multiple interacting species.
+    
+    Args:
+        t: Time point
+        y: Array of current population values for each species
+        params: Dictionary containing model parameters
+            - growth_rates: List of intrinsic growth rates for each species
+            - interaction_matrix: Matrix of interaction coefficients
+    
+    Returns:
+        ndarray: Derivatives for each species population
+    """
+    num_species = len(y)
+    carrying_capacities = params.get('carrying_capacities', [float('inf')] * num_species)
+    
+    return _multi_species_rhs(
+        t,
+        np.asarray(y, dtype=np.float64),
+        np.asarray(params['growth_rates'], dtype=np.float64),
+        _interaction_array(params['interaction_matrix']),
+        _inverse_capacities(carrying_capacities)
+    )
+
+@functools.lru_cache(maxsize=64)
+def _solve_multi_species(species_names, growth_rates, interaction_matrix,
+                         initial_populations, carrying_capacities, time_span,
+                         method, n_samples):
+    """
+    Solve a multi-species system. Memoized on its (hashable, tuple) arguments;
+    see run_multi_species_simulation for the public interface.
     """
     num_species = len(species_names)
     
@@ -69,31 +162,85 @@ def run_multi_species_simulation(species_names, growth_rates, interaction_matrix
     elif len(carrying_capacities) != num_species:
         raise ValueError("Carrying capacities list must match number of species")
     
-    # Setup parameters
-    params = {
-        'growth_rates': growth_rates,
-        'interaction_matrix': interaction_matrix,
-        'carrying_capacities': carrying_capacities
-    }
+    # Setup parameters as float64 arrays, converted once and handed to the
+    # compiled kernels as solver args rather than looked up on every RHS call
+    args = (
+        np.asarray(growth_rates, dtype=np.float64),
+        _interaction_array(interaction_matrix),
+        _inverse_capacities(carrying_capacities)
+    )
     
     # Initial conditions
     y0 = initial_populations
     
     # Time points
     t_span = (0, time_span)
-    t_eval = np.linspace(0, time_span, 1000)
+    t_eval = np.linspace(0, time_span, n_samples)
+    
+    # Implicit solvers take the analytic Jacobian instead of finite differences
+    solver_options = {}
+    if method in ('LSODA', 'BDF', 'Radau'):
+        solver_options['jac'] = _multi_species_jac
     
-    # Solve the ODE system
+    # Solve the ODE system. The compiled RHS takes a single state vector, so
+    # vectorized stays off; implicit methods have the analytic Jacobian and
+    # would not use it anyway
     solution = solve_ivp(
-        lambda t, y: multi_species_system(t, y, params),
+        _multi_species_rhs,
         t_span,
         y0,
-        method='RK45',
-        t_eval=t_eval
+        method=method,
+        t_eval=t_eval,
+        args=args,
+        vectorized=False,
+        **solver_options
     )
     
     return solution.t, solution.y.T
 
+def run_multi_species_simulation(species_names, growth_rates, interaction_matrix, 
+                                initial_populations, carrying_capacities=None, time_span=100,
+                                method='RK45', n_samples=1000):
+    """
+    Run a simulation with multiple interacting species.
+    
+    Args:
+        species_names (list): Names of each species in the ecosystem
+        growth_rates (list): Intrinsic growth rates for each species
+        interaction_matrix (list): Matrix of interaction coefficients
+        initial_populations (list): Initial population for each species
+        carrying_capacities (list, optional): Maximum sustainable population for each species
+        time_span (int): Duration of simulation
+        method (str): scipy solve_ivp method. Implicit methods ('Radau', 'BDF',
+            'LSODA') are given the analytic Jacobian.
+        n_samples (int): Number of evenly spaced output time points
+        
+    Returns:
+        tuple: (times, results) where times is an array of time points and
+               results is an array of population values for all species
+               (both read-only, as they may be shared through the cache)
+    """
+    def _key(values):
+        # Hashable cache key, rounded so float noise does not defeat the cache
+        return None if values is None else tuple(round(float(v), 9) for v in values)
+    
+    times, results = _solve_multi_species(
+        tuple(species_names),
+        _key(growth_rates),
+        tuple(_key(row) for row in interaction_matrix),
+        _key(initial_populations),
+        _key(carrying_capacities),
+        round(float(time_span), 9),
+        method,
+        int(n_samples)
+    )
+    
+    # Cached arrays are shared between callers, so hand them out read-only
+    times.setflags(write=False)
+    results.setflags(write=False)
+    
+    return times, results
+
 def create_food_web_example(ecosystem_type="forest", num_species=3, time_span=100):
     """
     Create an example food web with interactions between multiple species.
@@ -0,0 +1,163 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+import ecosystem_model as em
+from preset_scenarios import get_preset_scenarios
+
+ENV_PRESETS = [name for name, scenario in get_preset_scenarios().items()
+               if scenario['enable_env_change']]
+
+def _base_params(scenario):
+    return {
+        'alpha': scenario['prey_growth_rate'],
+        'beta': scenario['prey_death_rate'],
+        'gamma': scenario['predator_death_rate'],
+        'delta': scenario['predator_growth_rate']
+    }
+
+def _habitat_args(scenario):
+    return (
+        scenario['prey_growth_rate'], scenario['prey_death_rate'],
+        scenario['predator_death_rate'], scenario['predator_growth_rate'],
+        scenario['initial_prey'], scenario['initial_predator'], scenario['time_span'],
+        scenario['env_change_type'], scenario['env_change_start'], scenario['env_change_intensity']
+    )
+
+def _reference_solve(scenario, n_samples=1000, seed=0):
+    """
+    Tight DOP853 solve of the log-populations, restarted at every parameter
+    breakpoint and evaluating _current_env_params directly (no schedule).
+    """
+    base_params = _base_params(scenario)
+    env_changes = em._build_env_changes(
+        scenario['env_change_type'], scenario['env_change_start'],
+        scenario['env_change_intensity'], random.Random(seed)
+    )
+    
+    def rhs(t, u):
+        alpha, beta, gamma, delta = em._effective_rates(em._current_env_params(t, base_params, env_changes))
+        return [alpha - beta * np.exp(u[1]), delta * np.exp(u[0]) - gamma]
+    
+    time_span = scenario['time_span']
+    t_eval = np.linspace(0, time_span, n_samples)
+    knot_times, _ = em._env_param_schedule(base_params, env_changes)
+    breakpoints = sorted({0.0, float(time_span), *(t for t in knot_times if 0 < t < time_span)})
+    
+    u = np.log([scenario['initial_prey'], scenario['initial_predator']])
+    log_pops = np.empty((2, n_samples))
+    for start, end in zip(breakpoints[:-1], breakpoints[1:]):
+        inside = (t_eval >= start) & ((t_eval < end) | (end == time_span))
+        solution = solve_ivp(rhs, (start, end), u, method='DOP853', rtol=1e-12, atol=1e-12,
+                             dense_output=True)
+        assert solution.success
+        if inside.any():
+            log_pops[:, inside] = solution.sol(t_eval[inside])
+        u = solution.y[:, -1]
+    
+    return t_eval, log_pops
+
+@pytest.mark.parametrize('name', ENV_PRESETS)
+def test_habitat_presets_match_reference(name):
+    scenario = get_preset_scenarios()[name]
+    _, reference = _reference_solve(scenario)
+    
+    _, prey, predator, _ = em.run_habitat_change_simulation(
+        *_habitat_args(scenario), rng=random.Random(0)
+    )
+    
+    # Compare in log space: the presets pass through troughs far below 1e-15
+    np.testing.assert_allclose(np.log(prey), reference[0], rtol=0, atol=1e-3)
+    np.testing.assert_allclose(np.log(predator), reference[1], rtol=0, atol=1e-3)
+
+@pytest.mark.parametrize('method', ['odeint', 'LSODA', 'DOP853'])
+def test_habitat_methods_agree(method):
+    scenario = get_preset_scenarios()['Habitat Loss Scenario']
+    _, reference = _reference_solve(scenario)
+    
+    _, prey, predator, _ = em.run_habitat_change_simulation(*_habitat_args(scenario), method=method)
+    
+    np.testing.assert_allclose(np.log(prey), reference[0], rtol=0, atol=1e-3)
+    np.testing.assert_allclose(np.log(predator), reference[1], rtol=0, atol=1e-3)
+
+@pytest.mark.parametrize('name', list(get_preset_scenarios()))
+def test_every_preset_stays_finite_and_non_negative(name):
+    scenario = get_preset_scenarios()[name]
+    
+    if scenario['enable_env_change']:
+        # Default method (odeint), as the app runs it
+        _, prey, predator, _ = em.run_habitat_change_simulation(
+            *_habitat_args(scenario), rng=random.Random(0)
+        )
+    else:
+        _, prey, predator = em.run_lotka_volterra(*_habitat_args(scenario)[:7])
+    
+    for population in (prey, predator):
+        assert np.all(np.isfinite(population))
+        assert np.all(population >= 0)
+
+@pytest.mark.parametrize('name', ['Habitat Loss Scenario', 'Extreme Weather Events',
+                                  'Seasonal Migration Dynamics', 'Epidemic Scenario'])
+def test_sweep_rows_match_single_runs(name):
+    scenario = get_preset_scenarios()[name]
+    args = _habitat_args(scenario)
+    intensities = [25, 75]
+    
+    times, prey, predator = em.run_habitat_change_sweep(*args[:9], intensities, rng=random.Random(0))
+    
+    for k, intensity in enumerate(intensities):
+        single_times, single_prey, single_predator, _ = em.run_habitat_change_simulation(
+            *args[:9], intensity, rng=random.Random(0)
+        )
+        np.testing.assert_array_equal(times, single_times)
+        np.testing.assert_array_equal(prey[k], single_prey)
+        np.testing.assert_array_equal(predator[k], single_predator)
+
+def test_concurrent_habitat_runs_match_sequential():
+    def run(name):
+        return em.run_habitat_change_simulation(
+            *_habitat_args(get_preset_scenarios()[name]), rng=random.Random(0)
+        )
+    
+    sequential = [run(name) for name in ENV_PRESETS]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        concurrent = list(executor.map(run, ENV_PRESETS * 2))
+    
+    for expected, actual in zip(sequential * 2, concurrent):
+        np.testing.assert_array_equal(actual[1], expected[1])
+        np.testing.assert_array_equal(actual[2], expected[2])
+
+def _reference_lv(scenario):
+    """Reference solve of a preset without an environmental change."""
+    return _reference_solve(dict(scenario, env_change_type='None', env_change_intensity=0))
+
+@pytest.mark.parametrize('name', [name for name, scenario in get_preset_scenarios().items()
+                                  if not scenario['enable_env_change']])
+@pytest.mark.parametrize('method, tolerance', [('rk4', 1e-2), ('odeint', 1e-3),
+                                               ('LSODA', 1e-3), ('DOP853', 1e-3)])
+def test_lotka_volterra_methods_agree_with_reference(name, method, tolerance):
+    scenario = get_preset_scenarios()[name]
+    times, reference = _reference_lv(scenario)
+    
+    result_times, prey, predator = em.run_lotka_volterra(*_habitat_args(scenario)[:7], method=method)
+    
+    np.testing.assert_allclose(result_times, times)
+    # rk4 takes fixed steps of at most 0.01, so it gets a looser bound
+    np.testing.assert_allclose(np.log(prey), reference[0], rtol=0, atol=tolerance)
+    np.testing.assert_allclose(np.log(predator), reference[1], rtol=0, atol=tolerance)
+
+def test_batch_rows_match_single_runs():
+    scenarios = [scenario for scenario in get_preset_scenarios().values()
+                 if not scenario['enable_env_change']][:3]
+    params = [_habitat_args(scenario)[:4] for scenario in scenarios]
+    initial = [_habitat_args(scenario)[4:6] for scenario in scenarios]
+    
+    times, prey, predator = em.run_lotka_volterra_batch(params, initial, 150)
+    
+    for k, scenario in enumerate(scenarios):
+        _, single_prey, single_predator = em.run_lotka_volterra(*_habitat_args(scenario)[:6], 150)
+        np.testing.assert_allclose(prey[k], single_prey, rtol=1e-6)
+        np.testing.assert_allclose(predator[k], single_predator, rtol=1e-6)
@@ -0,0 +1,73 @@
+import numpy as np
+
+from utils import calculate_ecosystem_metrics, export_simulation_data
+
+def _cycles(n=1000, period=100, lag=25):
+    i = np.arange(n)
+    prey = 100 + 50 * np.sin(2 * np.pi * i / period)
+    predator = 100 + 50 * np.sin(2 * np.pi * (i - lag) / period)
+    return prey, predator
+
+def test_export_round_trip(tmp_path):
+    path = tmp_path / 'simulation.csv'
+    times = np.linspace(0, 100, 50)
+    prey = np.linspace(1e-20, 250.0, 50)
+    predator = np.geomspace(1e-30, 40.0, 50)
+    
+    assert export_simulation_data(times, prey, predator, str(path)).startswith("Data exported")
+    
+    loaded = np.loadtxt(path, delimiter=',', skiprows=1)
+    assert open(path).readline().strip() == 'Time,Prey,Predator'
+    np.testing.assert_allclose(loaded, np.column_stack((times, prey, predator)), rtol=1e-15, atol=0)
+
+def test_export_uses_each_column_precision(tmp_path):
+    path = tmp_path / 'simulation.csv'
+    times = np.linspace(0, 1, 11)
+    prey = np.full(11, 0.1, dtype=np.float32)
+    predator = np.full(11, 0.2, dtype=np.float32)
+    
+    export_simulation_data(times, prey, predator, str(path))
+    
+    first_row = open(path).read().splitlines()[2].split(',')
+    # float32 columns are written without float32 noise (0.1000000014901161)
+    assert first_row[1:] == ['0.1', '0.2']
+    loaded = np.loadtxt(path, delimiter=',', skiprows=1)
+    np.testing.assert_allclose(loaded[:, 0], times, rtol=1e-15)
+    np.testing.assert_array_equal(loaded[:, 1].astype(np.float32), prey)
+
+def test_metrics_of_known_cycles():
+    prey, predator = _cycles()
+    metrics = calculate_ecosystem_metrics(prey, predator)
+    
+    assert metrics.prey_peaks_count == metrics.predator_peaks_count == 10
+    assert metrics.prey_period == metrics.predator_period == 100
+    assert metrics.phase_difference == 25
+    np.testing.assert_allclose(metrics.prey_mean, 100, atol=1e-9)
+    np.testing.assert_allclose(metrics.prey_std, 50 / np.sqrt(2), rtol=1e-9)
+    np.testing.assert_allclose(metrics.prey_cv, metrics.prey_std / 100, rtol=1e-9)
+    np.testing.assert_allclose(metrics.ecosystem_stability, 1 / (2 * metrics.prey_cv), rtol=1e-9)
+    assert metrics.prey_min == prey.min() and metrics.prey_max == prey.max()
+    assert metrics.final_prey == prey[-1] and metrics.final_predator == predator[-1]
+
+def test_metrics_ignore_small_ripples():
+    prey, predator = _cycles()
+    ripple = 0.5 * np.sin(2 * np.pi * np.arange(prey.size) / 7)
+    metrics = calculate_ecosystem_metrics(prey + ripple, predator + ripple)
+    
+    assert metrics.prey_peaks_count == metrics.predator_peaks_count == 10
+    np.testing.assert_allclose(metrics.prey_period, 100, atol=1)
+
+def test_metrics_skip_oscillations_of_short_series():
+    prey, predator = _cycles(n=19, period=4, lag=1)
+    metrics = calculate_ecosystem_metrics(prey, predator)
+    
+    assert metrics.prey_peaks_count == metrics.predator_peaks_count == 0
+    assert metrics.prey_period == metrics.phase_difference == 0
+
+def test_metrics_accept_float32():
+    prey, predator = _cycles()
+    metrics = calculate_ecosystem_metrics(prey.astype(np.float32), predator.astype(np.float32))
+    
+    assert metrics.prey_peaks_count == 10
+    assert metrics.phase_difference == 25
+    np.testing.assert_allclose(metrics.prey_std, 50 / np.sqrt(2), rtol=1e-5)
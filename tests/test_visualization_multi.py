@@ -0,0 +1,45 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+from scipy import sparse
+
+import visualization_multi as vm
+from multispecies import create_food_web_example
+
+def _food_web_info():
+    return create_food_web_example()[2]
+
+def test_food_web_svg_export_stays_vector():
+    buffer = io.BytesIO()
+    vm.plot_food_web(_food_web_info()).savefig(buffer, format='svg')
+    assert b'<image' not in buffer.getvalue()
+
+def test_plot_food_web_async_returns_figure():
+    assert isinstance(vm.plot_food_web_async(_food_web_info()).result(timeout=60), Figure)
+
+def test_plot_food_web_async_uses_given_executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [vm.plot_food_web_async(_food_web_info(), executor=executor) for _ in range(3)]
+        assert all(isinstance(future.result(timeout=60), Figure) for future in futures)
+
+def test_interaction_edges_dense_and_sparse_agree():
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(12, 12)) * (rng.random((12, 12)) < 0.3)
+    np.fill_diagonal(matrix, 1.0)
+    dense = vm._interaction_edges(matrix)
+    
+    for converted in (sparse.csr_array(matrix), sparse.coo_array(matrix), sparse.csc_matrix(matrix)):
+        for expected, actual in zip(dense, vm._interaction_edges(converted)):
+            np.testing.assert_array_equal(actual, expected)
+
+def test_minmax_segments_keep_extremes():
+    times = np.linspace(0, 10, 1001)
+    results = np.column_stack((np.sin(times * 7), np.cos(times * 3)))
+    segments = vm._minmax_segments(times, results, 64)
+    
+    assert segments.shape == (2, 128, 2)
+    assert np.all(np.diff(segments[:, :, 0], axis=1) >= 0)
+    np.testing.assert_array_equal(segments[:, :, 1].min(axis=1), results.min(axis=0))
+    np.testing.assert_array_equal(segments[:, :, 1].max(axis=1), results.max(axis=0))
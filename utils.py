@@ -1,102 +1,263 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 import json
 import os
+from collections import namedtuple
 from datetime import datetime
+from types import MappingProxyType
+from scipy.signal import find_peaks
+from jit import njit, NUMBA_AVAILABLE
 
-def save_scenario(name, scenario_data):
+try:
+    # Optional C JSON codec for the scenario store (pip install orjson)
+    import orjson
+except ImportError:
+    orjson = None
+
+# Saved scenarios are kept in a JSON file next to the app so they survive restarts
+SCENARIO_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'saved_scenarios.json')
+
+# Shortest series calculate_ecosystem_metrics looks for population cycles in
+MIN_OSCILLATION_SAMPLES = 20
+
+# Parameters returned by load_scenario for unknown names; shared and read-only
+_DEFAULT_SCENARIO = MappingProxyType({
+    'prey_growth_rate': 1.0,
+    'prey_death_rate': 0.1,
+    'initial_prey': 100,
+    'predator_death_rate': 0.3,
+    'predator_growth_rate': 0.1,
+    'initial_predator': 50,
+    'time_span': 100,
+    'enable_env_change': False,
+    'env_change_type': "None",
+    'env_change_start': 0,
+    'env_change_intensity': 0
+})
+
+def _encode_store(store):
+    """
+    Serialize the scenario store to indented UTF-8 JSON, with orjson when it
+    is installed and the standard library otherwise.
+    
+    Args:
+        store (dict): Mapping of scenario name to scenario parameters
+        
+    Returns:
+        bytes: Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(store, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(store, indent=2).encode('utf-8')
+
+def _decode_store(data):
     """
-    Save the current scenario to session state.
+    Parse a scenario store written by _encode_store.
+    
+    Args:
+        data (bytes): Encoded JSON document
+        
+    Returns:
+        dict: Mapping of scenario name to scenario parameters
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _read_scenario_store():
+    """
+    Read every saved scenario from the on-disk store.
+    
+    Returns:
+        dict: Mapping of scenario name to scenario parameters
+    """
+    if not os.path.exists(SCENARIO_STORE_PATH):
+        return {}
+    with open(SCENARIO_STORE_PATH, 'rb') as f:
+        return _decode_store(f.read())
+
+@st.cache_data(persist="disk", max_entries=256, show_spinner=False)
+def _get_scenario(name):
+    return _read_scenario_store().get(name)
+
+def _put_scenario(name, scenario_data):
+    """
+    Write a scenario to the on-disk store and drop its cached copy.
     
     Args:
         name (str): Name of the scenario
         scenario_data (dict): Dictionary containing scenario parameters
     """
-    # If saved_scenarios doesn't exist in session state, create it
-    if 'saved_scenarios' not in st.session_state:
-        st.session_state.saved_scenarios = {}
+    store = _read_scenario_store()
+    store[name] = scenario_data
+    
+    # Write to a temporary file first so a failed write never corrupts the store
+    tmp_path = SCENARIO_STORE_PATH + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_encode_store(store))
+    os.replace(tmp_path, SCENARIO_STORE_PATH)
+    
+    _get_scenario.clear(name)
+
+def list_saved_scenarios():
+    """
+    List the names of all saved scenarios.
+    
+    Returns:
+        list: Saved scenario names
+    """
+    return list(_read_scenario_store().keys())
+
+def save_scenario(name, scenario_data):
+    """
+    Save the current scenario to the on-disk scenario store.
     
+    Args:
+        name (str): Name of the scenario
+        scenario_data (dict): Dictionary containing scenario parameters
+    """
     # Add timestamp to scenario data
     scenario_data['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    # Save to session state
-    st.session_state.saved_scenarios[name] = scenario_data
+    _put_scenario(name, scenario_data)
 
 def load_scenario(name):
     """
-    Load a scenario from session state.
+    Load a scenario from the on-disk scenario store.
     
     Args:
         name (str): Name of the scenario to load
         
     Returns:
-        dict: Dictionary containing scenario parameters
+        dict: Dictionary containing scenario parameters, or the read-only
+              default scenario if no scenario of that name is saved
     """
-    if 'saved_scenarios' in st.session_state and name in st.session_state.saved_scenarios:
-        return st.session_state.saved_scenarios[name].copy()
-    else:
-        # Return default values if scenario not found
-        return {
-            'prey_growth_rate': 1.0,
-            'prey_death_rate': 0.1,
-            'initial_prey': 100,
-            'predator_death_rate': 0.3,
-            'predator_growth_rate': 0.1,
-            'initial_predator': 50,
-            'time_span': 100,
-            'enable_env_change': False,
-            'env_change_type': "None",
-            'env_change_start': 0,
-            'env_change_intensity': 0
-        }
-
-def export_simulation_data(times, results, filename='simulation_data.csv'):
+    # st.cache_data hands every caller its own copy, so no copy is made here
+    scenario = _get_scenario(name)
+    if scenario is not None:
+        return scenario
+    
+    # Return default values if scenario not found
+    return _DEFAULT_SCENARIO
+
+def export_simulation_data(times, prey_pop, predator_pop, filename='simulation_data.csv'):
     """
     Export simulation results to a CSV file.
     
     Args:
         times (array): Time points
-        results (array): Population values
+        prey_pop (array): Prey population values
+        predator_pop (array): Predator population values
         filename (str): Name of output file
         
     Returns:
         str: Path to saved file or error message
     """
     try:
-        df = pd.DataFrame({
-            'Time': times,
-            'Prey': results[:, 0],
-            'Predator': results[:, 1]
-        })
+        # Written straight from the arrays; a DataFrame adds nothing for
+        # three float columns
+        columns = (times, prey_pop, predator_pop)
+        data = np.column_stack(columns)
         
-        df.to_csv(filename, index=False)
+        # As many digits as each column carries: 7 for the app's float32
+        # results, 16 for float64. Taken from the inputs, since column_stack
+        # promotes a float32 column next to float64 times to float64
+        fmt = [f'%.{np.finfo(np.result_type(np.asarray(column).dtype, np.float32)).precision + 1}g'
+               for column in columns]
+        np.savetxt(
+            filename,
+            data,
+            delimiter=',',
+            header='Time,Prey,Predator',
+            comments='',
+            fmt=fmt
+        )
         return f"Data exported successfully to {filename}"
     except Exception as e:
         return f"Error exporting data: {str(e)}"
 
-def calculate_ecosystem_metrics(results):
+# Result of calculate_ecosystem_metrics
+EcosystemMetrics = namedtuple('EcosystemMetrics', [
+    'prey_mean', 'prey_std', 'prey_min', 'prey_max', 'prey_cv',
+    'predator_mean', 'predator_std', 'predator_min', 'predator_max', 'predator_cv',
+    'ecosystem_stability', 'final_prey', 'final_predator',
+    'prey_period', 'predator_period', 'phase_difference',
+    'prey_peaks_count', 'predator_peaks_count'
+])
+
+@njit(cache=True)
+def _summary_stats(values):
     """
-    Calculate various ecological metrics from simulation results.
+    Mean, standard deviation, minimum and maximum of a series in a single
+    pass (Welford's update for the mean and variance).
     
     Args:
-        results (array): Population values for prey and predator
+        values (array): Population values
         
     Returns:
-        dict: Dictionary of ecological metrics
+        tuple: (mean, std, min, max)
     """
-    prey_pop = results[:, 0]
-    predator_pop = results[:, 1]
+    mean = 0.0
+    m2 = 0.0
+    lowest = values[0]
+    highest = values[0]
+    for i in range(len(values)):
+        value = values[i]
+        delta = value - mean
+        mean += delta / (i + 1)
+        m2 += delta * (value - mean)
+        if value < lowest:
+            lowest = value
+        if value > highest:
+            highest = value
+    return mean, np.sqrt(m2 / len(values)), lowest, highest
+
+if not NUMBA_AVAILABLE:
+    def _summary_stats(values):
+        """
+        Mean, standard deviation, minimum and maximum of a series from the
+        NumPy reductions. Without Numba the single pass above would run as
+        interpreted Python over every sample.
+        
+        Args:
+            values (array): Population values
+            
+        Returns:
+            tuple: (mean, std, min, max)
+        """
+        return values.mean(), values.std(), values.min(), values.max()
+
+def _peak_indices(population, std):
+    """
+    Indices of the population peaks, ignoring bumps too small to be part of
+    a population cycle (such as solver noise near a trough).
     
-    # Basic statistics
-    prey_mean = prey_pop.mean()
-    prey_std = prey_pop.std()
-    prey_min = prey_pop.min()
-    prey_max = prey_pop.max()
+    Args:
+        population (array): Population values
+        std (float): Standard deviation of the population values
+        
+    Returns:
+        ndarray: Increasing indices of the peaks
+    """
+    # A peak must rise at least a tenth of a standard deviation above the
+    # surrounding troughs to count
+    peaks, _ = find_peaks(population, prominence=0.1 * std)
+    return peaks
+
+def calculate_ecosystem_metrics(prey_pop, predator_pop):
+    """
+    Calculate various ecological metrics from simulation results.
     
-    predator_mean = predator_pop.mean()
-    predator_std = predator_pop.std()
-    predator_min = predator_pop.min()
-    predator_max = predator_pop.max()
+    Args:
+        prey_pop (array): Prey population values
+        predator_pop (array): Predator population values
+        
+    Returns:
+        EcosystemMetrics: Named tuple of ecological metrics
+    """
+    # Basic statistics, one pass over each series
+    prey_mean, prey_std, prey_min, prey_max = _summary_stats(prey_pop)
+    predator_mean, predator_std, predator_min, predator_max = _summary_stats(predator_pop)
     
     # Population stability (coefficient of variation)
     prey_cv = prey_std / prey_mean if prey_mean > 0 else 0
@@ -109,57 +270,50 @@ def calculate_ecosystem_metrics(results):
     final_prey = prey_pop[-1]
     final_predator = predator_pop[-1]
     
-    # Oscillation analysis
-    prey_peaks = []
-    predator_peaks = []
-    
-    for i in range(1, len(prey_pop)-1):
-        if prey_pop[i] > prey_pop[i-1] and prey_pop[i] > prey_pop[i+1]:
-            prey_peaks.append((i, prey_pop[i]))
-        if predator_pop[i] > predator_pop[i-1] and predator_pop[i] > predator_pop[i+1]:
-            predator_peaks.append((i, predator_pop[i]))
+    # Oscillation analysis, skipped for series too short to hold a full cycle
+    if len(prey_pop) < MIN_OSCILLATION_SAMPLES:
+        prey_peaks = predator_peaks = np.empty(0, dtype=np.int64)
+    else:
+        prey_peaks = _peak_indices(prey_pop, prey_std)
+        predator_peaks = _peak_indices(predator_pop, predator_std)
     
     # Estimate average cycle period if there are enough peaks
     prey_period = 0
     predator_period = 0
     
-    if len(prey_peaks) >= 2:
-        peak_indices = [p[0] for p in prey_peaks]
-        avg_interval = sum(peak_indices[i+1] - peak_indices[i] for i in range(len(peak_indices)-1)) / (len(peak_indices)-1)
-        prey_period = avg_interval
+    # The mean interval between consecutive peaks telescopes to the span from
+    # the first peak to the last over the number of intervals
+    if prey_peaks.size >= 2:
+        prey_period = (prey_peaks[-1] - prey_peaks[0]) / (prey_peaks.size - 1)
     
-    if len(predator_peaks) >= 2:
-        peak_indices = [p[0] for p in predator_peaks]
-        avg_interval = sum(peak_indices[i+1] - peak_indices[i] for i in range(len(peak_indices)-1)) / (len(peak_indices)-1)
-        predator_period = avg_interval
+    if predator_peaks.size >= 2:
+        predator_period = (predator_peaks[-1] - predator_peaks[0]) / (predator_peaks.size - 1)
     
     # Phase difference (time lag between prey and predator peaks)
     phase_diff = 0
-    if len(prey_peaks) >= 1 and len(predator_peaks) >= 1:
-        # Find the nearest predator peak after the first prey peak
-        prey_peak_idx = prey_peaks[0][0]
-        next_predator_peaks = [(i, p) for i, p in enumerate(predator_peaks) if p[0] > prey_peak_idx]
-        if next_predator_peaks:
-            next_predator_peak_idx = next_predator_peaks[0][1][0]
-            phase_diff = next_predator_peak_idx - prey_peak_idx
-    
-    return {
-        'prey_mean': prey_mean,
-        'prey_std': prey_std,
-        'prey_min': prey_min,
-        'prey_max': prey_max,
-        'prey_cv': prey_cv,
-        'predator_mean': predator_mean,
-        'predator_std': predator_std,
-        'predator_min': predator_min,
-        'predator_max': predator_max,
-        'predator_cv': predator_cv,
-        'ecosystem_stability': ecosystem_stability,
-        'final_prey': final_prey,
-        'final_predator': final_predator,
-        'prey_period': prey_period,
-        'predator_period': predator_period,
-        'phase_difference': phase_diff,
-        'prey_peaks_count': len(prey_peaks),
-        'predator_peaks_count': len(predator_peaks)
-    }
+    if prey_peaks.size >= 1 and predator_peaks.size >= 1:
+        # Find the nearest predator peak after the first prey peak (peaks are sorted)
+        next_predator = np.searchsorted(predator_peaks, prey_peaks[0], side='right')
+        if next_predator < predator_peaks.size:
+            phase_diff = predator_peaks[next_predator] - prey_peaks[0]
+    
+    return EcosystemMetrics(
+        prey_mean=prey_mean,
+        prey_std=prey_std,
+        prey_min=prey_min,
+        prey_max=prey_max,
+        prey_cv=prey_cv,
+        predator_mean=predator_mean,
+        predator_std=predator_std,
+        predator_min=predator_min,
+        predator_max=predator_max,
+        predator_cv=predator_cv,
+        ecosystem_stability=ecosystem_stability,
+        final_prey=final_prey,
+        final_predator=final_predator,
+        prey_period=prey_period,
+        predator_period=predator_period,
+        phase_difference=phase_diff,
+        prey_peaks_count=prey_peaks.size,
+        predator_peaks_count=predator_peaks.size
+    )
@@ -1,28 +1,93 @@
-import matplotlib.pyplot as plt
 import numpy as np
-import plotly.graph_objects as go
-import networkx as nx
-from matplotlib.patches import ConnectionPatch
-import matplotlib.cm as cm
 
-def plot_population_trends(times, results, events=None, plot_type='matplotlib'):
+# matplotlib and plotly are imported inside the plotting functions, so
+# importing this module (or only using one backend) does not pay for both
+
+def lttb_downsample(x, y, n_out):
+    """
+    Downsample a series with the Largest-Triangle-Three-Buckets algorithm.
+    
+    The first and last points are always kept; every other bucket keeps the
+    point forming the largest triangle with its neighbours, which preserves
+    the visual shape (peaks and troughs) of the series.
+    
+    Args:
+        x (array): Monotonically increasing x values
+        y (array): Series values
+        n_out (int): Number of points to keep
+        
+    Returns:
+        tuple: (x, y) downsampled arrays, or the inputs if already small enough
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    
+    # n_out - 2 buckets spanning the interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0] = 0
+    idx[-1] = n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                      (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    
+    return x[idx], y[idx]
+
+def _decimate(values, n_out=2000):
+    """
+    Keep n_out evenly spaced samples (always including the first and last)
+    of a series that is longer than that; shorter series are returned as is.
+    """
+    if len(values) <= n_out:
+        return values
+    return values[np.linspace(0, len(values) - 1, n_out).astype(np.intp)]
+
+# Static part of the plotly population trend layout
+_TRENDS_LAYOUT = dict(
+    title=dict(text='Predator-Prey Population Dynamics'),
+    xaxis=dict(title=dict(text='Time')),
+    yaxis=dict(title=dict(text='Population')),
+    hovermode='x unified',
+    legend=dict(
+        yanchor="top",
+        y=0.99,
+        xanchor="left",
+        x=0.01
+    )
+)
+
+def plot_population_trends(times, prey_pop, predator_pop, events=None, plot_type='matplotlib',
+                           max_points=None):
     """
     Plot the population trends over time.
     
     Args:
         times (array): Time points
-        results (array): Population values for prey and predator
+        prey_pop (array): Prey population values
+        predator_pop (array): Predator population values
         events (list): List of environmental change events
         plot_type (str): Type of plot ('matplotlib' or 'plotly')
-        
+        max_points (int, optional): Downsample each plotly trace to at most this
+            many points with LTTB; the matplotlib plot always uses full resolution
+            
     Returns:
         matplotlib.figure.Figure or plotly.graph_objects.Figure: Plot object
     """
-    prey_pop = results[:, 0]
-    predator_pop = results[:, 1]
-    
     if plot_type == 'matplotlib':
-        fig, ax = plt.subplots(figsize=(10, 6))
+        from matplotlib.figure import Figure
+        
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
         
         # Plot populations
         ax.plot(times, prey_pop, 'b-', label='Prey')
@@ -30,10 +95,16 @@ def plot_population_trends(times, results, events=None, plot_type='matplotlib'):
         
         # Add event markers if provided
         if events:
+            # Full-height lines for every event in one call (x in data
+            # coordinates, y in axes coordinates, like axvline)
+            event_times = [event['time'] for event in events]
+            ax.vlines(event_times, 0, 1, transform=ax.get_xaxis_transform(),
+                      colors='green', linestyles='--', alpha=0.6)
+            
+            label_y = max(np.max(prey_pop), np.max(predator_pop)) * 0.9
             for event in events:
-                ax.axvline(x=event['time'], color='green', linestyle='--', alpha=0.6)
-                ax.text(event['time'], max(np.max(prey_pop), np.max(predator_pop)) * 0.9, 
-                        event['description'], rotation=90, verticalalignment='top')
+                ax.text(event['time'], label_y, event['description'],
+                        rotation=90, verticalalignment='top')
         
         ax.set_xlabel('Time')
         ax.set_ylabel('Population')
@@ -44,78 +115,215 @@ def plot_population_trends(times, results, events=None, plot_type='matplotlib'):
         return fig
     
     elif plot_type == 'plotly':
-        fig = go.Figure()
+        import plotly.graph_objects as go
         
-        # Add population traces
-        fig.add_trace(go.Scatter(
-            x=times, y=prey_pop,
-            name='Prey',
-            line=dict(color='blue', width=2)
-        ))
+        # Reduce long series to the points that matter at screen resolution
+        prey_times, predator_times = times, times
+        if max_points is not None:
+            prey_times, prey_pop = lttb_downsample(times, prey_pop, max_points)
+            predator_times, predator_pop = lttb_downsample(times, predator_pop, max_points)
         
-        fig.add_trace(go.Scatter(
-            x=times, y=predator_pop,
-            name='Predator',
-            line=dict(color='red', width=2)
-        ))
+        # Population traces (WebGL rendered to keep long series responsive)
+        data = [
+            dict(type='scattergl', x=prey_times, y=prey_pop, mode='lines',
+                 name='Prey', line=dict(color='blue', width=2)),
+            dict(type='scattergl', x=predator_times, y=predator_pop, mode='lines',
+                 name='Predator', line=dict(color='red', width=2))
+        ]
         
-        # Add event markers if provided
+        layout = dict(_TRENDS_LAYOUT)
+        
+        # Add event markers if provided: the shape and label fig.add_vline
+        # would add, built directly rather than by one relayout per event
         if events:
-            for event in events:
-                fig.add_vline(
-                    x=event['time'], 
-                    line_dash="dash", 
-                    line_color="green",
-                    annotation_text=event['description'],
-                    annotation_position="top right"
-                )
-        
-        # Update layout
-        fig.update_layout(
-            title='Predator-Prey Population Dynamics',
-            xaxis_title='Time',
-            yaxis_title='Population',
-            hovermode='x unified',
-            legend=dict(
-                yanchor="top",
-                y=0.99,
-                xanchor="left",
-                x=0.01
-            )
-        )
+            layout['shapes'] = [
+                dict(type='line', x0=event['time'], x1=event['time'], xref='x',
+                     y0=0, y1=1, yref='y domain', line=dict(color='green', dash='dash'))
+                for event in events
+            ]
+            layout['annotations'] = [
+                dict(text=event['description'], x=event['time'], xref='x', xanchor='left',
+                     y=1, yref='y domain', yanchor='top', showarrow=False)
+                for event in events
+            ]
+        
+        # The whole figure is validated once, in a single constructor call
+        fig = go.Figure(dict(data=data, layout=layout))
         
         return fig
 
-def plot_phase_space(results):
+def plot_scenario_comparison(times, prey_pop, predator_pop, names):
     """
-    Plot the phase space diagram (predator vs prey).
+    Overlay the population trends of several scenarios.
     
     Args:
-        results (array): Population values for prey and predator
+        times (array): Time points shared by all scenarios
+        prey_pop (array): Prey values of shape (scenarios, time points)
+        predator_pop (array): Predator values of shape (scenarios, time points)
+        names (list): Scenario names, one per scenario
         
     Returns:
-        matplotlib.figure.Figure: Plot object
+        plotly.graph_objects.Figure: Plot object
     """
-    prey_pop = results[:, 0]
-    predator_pop = results[:, 1]
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
     
-    fig, ax = plt.subplots(figsize=(8, 8))
+    fig = go.Figure()
+    palette = qualitative.Plotly
     
-    # Plot the phase space trajectory
-    ax.plot(prey_pop, predator_pop, 'g-', alpha=0.6)
-    ax.plot(prey_pop[0], predator_pop[0], 'go', markersize=8, label='Start')
-    ax.plot(prey_pop[-1], predator_pop[-1], 'ro', markersize=8, label='End')
+    # Prey as solid lines, predators dashed, one colour per scenario
+    for i, name in enumerate(names):
+        color = palette[i % len(palette)]
+        fig.add_trace(go.Scattergl(
+            x=times, y=prey_pop[i],
+            mode='lines',
+            name=f'{name} - Prey',
+            line=dict(color=color, width=2)
+        ))
+        fig.add_trace(go.Scattergl(
+            x=times, y=predator_pop[i],
+            mode='lines',
+            name=f'{name} - Predator',
+            line=dict(color=color, width=2, dash='dash')
+        ))
+    
+    fig.update_layout(
+        title='Saved Scenario Comparison',
+        xaxis_title='Time',
+        yaxis_title='Population',
+        hovermode='x unified'
+    )
     
-    # Add direction arrows at regular intervals
+    return fig
+
+def plot_intensity_sweep(times, prey_pop, predator_pop, intensities):
+    """
+    Small-multiples plot of one environmental change at several intensities.
+    
+    Args:
+        times (array): Time points shared by all runs
+        prey_pop (array): Prey values of shape (runs, time points)
+        predator_pop (array): Predator values of shape (runs, time points)
+        intensities (list): Change intensity (%) of each run
+        
+    Returns:
+        plotly.graph_objects.Figure: Plot object with one panel per intensity
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
+    num_runs = len(intensities)
+    fig = make_subplots(
+        rows=num_runs, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.04,
+        subplot_titles=[f"Intensity {intensity}%" for intensity in intensities]
+    )
+    
+    for i in range(num_runs):
+        fig.add_trace(go.Scattergl(
+            x=times, y=prey_pop[i],
+            mode='lines',
+            name='Prey',
+            legendgroup='prey',
+            showlegend=i == 0,
+            line=dict(color='blue', width=2)
+        ), row=i + 1, col=1)
+        fig.add_trace(go.Scattergl(
+            x=times, y=predator_pop[i],
+            mode='lines',
+            name='Predator',
+            legendgroup='predator',
+            showlegend=i == 0,
+            line=dict(color='red', width=2)
+        ), row=i + 1, col=1)
+    
+    fig.update_xaxes(title_text='Time', row=num_runs, col=1)
+    fig.update_layout(
+        title='Environmental Change Intensity Sweep',
+        height=max(300, 220 * num_runs)
+    )
+    
+    return fig
+
+def plot_phase_space(prey_pop, predator_pop, plot_type='matplotlib'):
+    """
+    Plot the phase space diagram (predator vs prey).
+    
+    Args:
+        prey_pop (array): Prey population values
+        predator_pop (array): Predator population values
+        plot_type (str): Type of plot ('matplotlib' or 'plotly')
+        
+    Returns:
+        matplotlib.figure.Figure or plotly.graph_objects.Figure: Plot object
+    """
+    # Direction arrows at regular intervals
     num_arrows = 10
     indices = np.linspace(0, len(prey_pop)-2, num_arrows, dtype=int)
     
-    for i in indices:
-        ax.annotate('', 
-                   xy=(prey_pop[i+1], predator_pop[i+1]),
-                   xytext=(prey_pop[i], predator_pop[i]),
-                   arrowprops=dict(arrowstyle='->', color='blue', lw=1.5),
-                   )
+    if plot_type == 'plotly':
+        import plotly.graph_objects as go
+        
+        fig = go.Figure()
+        
+        # WebGL trajectory keeps the full series responsive
+        fig.add_trace(go.Scattergl(
+            x=prey_pop, y=predator_pop,
+            mode='lines',
+            name='Trajectory',
+            line=dict(color='green'),
+            opacity=0.6
+        ))
+        fig.add_trace(go.Scattergl(
+            x=[prey_pop[0]], y=[predator_pop[0]],
+            mode='markers',
+            name='Start',
+            marker=dict(color='green', size=10)
+        ))
+        fig.add_trace(go.Scattergl(
+            x=[prey_pop[-1]], y=[predator_pop[-1]],
+            mode='markers',
+            name='End',
+            marker=dict(color='red', size=10)
+        ))
+        
+        for i in indices:
+            fig.add_annotation(
+                x=prey_pop[i+1], y=predator_pop[i+1],
+                ax=prey_pop[i], ay=predator_pop[i],
+                xref='x', yref='y', axref='x', ayref='y',
+                showarrow=True, arrowhead=2, arrowwidth=1.5, arrowcolor='blue'
+            )
+        
+        fig.update_layout(
+            title='Phase Space Diagram',
+            xaxis_title='Prey Population',
+            yaxis_title='Predator Population'
+        )
+        
+        return fig
+    
+    from matplotlib.figure import Figure
+    
+    fig = Figure(figsize=(8, 8))
+    ax = fig.subplots()
+    
+    # Plot the phase space trajectory, thinned to what the figure can resolve
+    ax.plot(_decimate(prey_pop), _decimate(predator_pop), 'g-', alpha=0.6)
+    ax.plot(prey_pop[0], predator_pop[0], 'go', markersize=8, label='Start')
+    ax.plot(prey_pop[-1], predator_pop[-1], 'ro', markersize=8, label='End')
+    
+    # All direction arrows in one quiver call. Consecutive samples are very
+    # close together, so only the direction is taken from them; each arrow
+    # is drawn a fixed 0.3 inches long, pointing at the next sample
+    dx = np.asarray(prey_pop[indices + 1], dtype=np.float64) - prey_pop[indices]
+    dy = np.asarray(predator_pop[indices + 1], dtype=np.float64) - predator_pop[indices]
+    norm = np.hypot(dx, dy)
+    norm[norm == 0] = 1.0
+    ax.quiver(prey_pop[indices + 1], predator_pop[indices + 1], dx / norm, dy / norm,
+              angles='xy', scale_units='inches', scale=1 / 0.3, pivot='tip',
+              color='blue', width=0.004, zorder=3)
     
     ax.set_xlabel('Prey Population')
     ax.set_ylabel('Predator Population')
@@ -125,6 +333,96 @@ def plot_phase_space(results):
     
     return fig
 
+def plot_population_correlation(prey_pop, predator_pop, plot_type='matplotlib'):
+    """
+    Scatter plot of predator against prey population with a regression line.
+    
+    Args:
+        prey_pop (array): Prey population values
+        predator_pop (array): Predator population values
+        plot_type (str): Type of plot ('matplotlib' or 'plotly')
+        
+    Returns:
+        matplotlib.figure.Figure or plotly.graph_objects.Figure: Plot object
+    """
+    # Least-squares regression line (closed form for a degree-1 fit),
+    # fitted on the full series rather than the plotted subset
+    x = np.asarray(prey_pop, dtype=np.float64)
+    y = np.asarray(predator_pop, dtype=np.float64)
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    x_var = np.dot(dx, dx)
+    x_line = None
+    if x_var > 0:
+        m = np.dot(dx, y - y_mean) / x_var
+        b = y_mean - m * x_mean
+        x_line = np.linspace(x.min(), x.max(), 100)
+    
+    if plot_type == 'plotly':
+        import plotly.graph_objects as go
+        
+        # WebGL scatter of every point
+        fig = go.Figure(go.Scattergl(
+            x=prey_pop, y=predator_pop,
+            mode='markers',
+            name='Populations',
+            marker=dict(size=3, opacity=0.5)
+        ))
+        if x_line is not None:
+            fig.add_trace(go.Scattergl(
+                x=x_line, y=m * x_line + b,
+                mode='lines',
+                name='Regression',
+                line=dict(color='red')
+            ))
+        
+        fig.update_layout(
+            title='Predator vs Prey Population Correlation',
+            xaxis_title='Prey Population',
+            yaxis_title='Predator Population',
+            showlegend=False
+        )
+        
+        return fig
+    
+    from matplotlib.figure import Figure
+    
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.scatter(_decimate(prey_pop), _decimate(predator_pop), alpha=0.5, s=5)
+    if x_line is not None:
+        ax.plot(x_line, m * x_line + b, 'r-')
+    
+    ax.set_xlabel('Prey Population')
+    ax.set_ylabel('Predator Population')
+    ax.set_title('Predator vs Prey Population Correlation')
+    ax.grid(alpha=0.3)
+    
+    return fig
+
+def plot_power_spectrum(cycle_lengths, amplitudes):
+    """
+    Plot FFT amplitude against cycle length.
+    
+    Args:
+        cycle_lengths (array): Cycle lengths (inverse frequencies)
+        amplitudes (array): FFT amplitude at each cycle length
+        
+    Returns:
+        matplotlib.figure.Figure: Plot object
+    """
+    from matplotlib.figure import Figure
+    
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.plot(cycle_lengths, amplitudes)
+    ax.set_xlabel('Cycle Length (time units)')
+    ax.set_ylabel('Amplitude')
+    ax.set_title('Power Spectrum - Dominant Cycles')
+    
+    return fig
+
 def plot_ecological_network(network_data):
     """
     Create a network visualization of the ecosystem.
@@ -135,10 +433,6 @@ def plot_ecological_network(network_data):
     Returns:
         matplotlib.figure.Figure: Network visualization
     """
-    # Create graph
-    G = nx.DiGraph()
-    
-    # Add nodes
     prey_pop = network_data.get('prey_pop', 100)
     predator_pop = network_data.get('predator_pop', 50)
     
@@ -147,89 +441,61 @@ def plot_ecological_network(network_data):
     prey_size = 2000 * (prey_pop / max_pop)
     predator_size = 2000 * (predator_pop / max_pop)
     
-    # Add nodes
-    G.add_node("Sun", pos=(0, 3), node_type="resource")
-    G.add_node("Vegetation", pos=(0, 2), node_type="resource")
-    G.add_node("Prey", pos=(0, 1), node_type="species", population=prey_pop)
-    G.add_node("Predator", pos=(0, 0), node_type="species", population=predator_pop)
-    G.add_node("Decomposers", pos=(1, 1.5), node_type="resource")
+    # The diagram is a fixed five-node graph, so it is drawn directly with
+    # matplotlib primitives rather than through a networkx graph
+    nodes = ["Sun", "Vegetation", "Prey", "Predator", "Decomposers"]
+    pos = np.array([(-1, 4), (0, 3), (0, 1), (0, -1), (2, 1)])
+    node_color = ["yellow", "green", "blue", "red", "brown"]
+    node_size = np.array([1500, 1000, prey_size, predator_size, 800])
     
-    # Add edges with weights
+    # Edges as (source, target, weight) node indices
     prey_growth = network_data.get('prey_growth_rate', 1.0)
     prey_death = network_data.get('prey_death_rate', 0.1)
     predator_growth = network_data.get('predator_growth_rate', 0.1)
     predator_death = network_data.get('predator_death_rate', 0.3)
     
-    G.add_edge("Sun", "Vegetation", weight=5.0)
-    G.add_edge("Vegetation", "Prey", weight=prey_growth * 10)
-    G.add_edge("Prey", "Predator", weight=predator_growth * 10)
-    G.add_edge("Predator", "Decomposers", weight=predator_death * 10)
-    G.add_edge("Prey", "Decomposers", weight=prey_death * 5)
-    G.add_edge("Decomposers", "Vegetation", weight=3.0)
+    edges = [
+        (0, 1, 5.0),                   # Sun -> Vegetation
+        (1, 2, prey_growth * 10),      # Vegetation -> Prey
+        (2, 3, predator_growth * 10),  # Prey -> Predator
+        (3, 4, predator_death * 10),   # Predator -> Decomposers
+        (2, 4, prey_death * 5),        # Prey -> Decomposers
+        (4, 1, 3.0)                    # Decomposers -> Vegetation
+    ]
+    
+    from matplotlib.figure import Figure
+    from matplotlib.patches import FancyArrowPatch
     
     # Create figure
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
-    # Set positions
-    pos = {
-        "Sun": (-1, 4),
-        "Vegetation": (0, 3),
-        "Prey": (0, 1),
-        "Predator": (0, -1),
-        "Decomposers": (2, 1)
-    }
-    
-    # Node colors and sizes
-    node_color = {
-        "Sun": "yellow",
-        "Vegetation": "green",
-        "Prey": "blue",
-        "Predator": "red",
-        "Decomposers": "brown"
-    }
-    
-    node_size = {
-        "Sun": 1500,
-        "Vegetation": 1000,
-        "Prey": prey_size,
-        "Predator": predator_size,
-        "Decomposers": 800
-    }
-    
-    # Draw nodes
-    for node in G.nodes():
-        nx.draw_networkx_nodes(
-            G, pos, 
-            nodelist=[node],
-            node_color=node_color[node],
-            node_size=node_size[node],
-            alpha=0.8,
-            ax=ax
-        )
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+    
+    # Draw all nodes in one call
+    ax.scatter(pos[:, 0], pos[:, 1], s=node_size, c=node_color, alpha=0.8, zorder=2)
     
     # Draw node labels
-    nx.draw_networkx_labels(
-        G, pos,
-        font_size=12,
-        font_family="sans-serif",
-        ax=ax
-    )
+    for name, (x, y) in zip(nodes, pos):
+        ax.text(x, y, name, fontsize=12, fontfamily="sans-serif",
+                ha='center', va='center', zorder=3)
     
-    # Draw edges with varying widths based on weight
-    for u, v, data in G.edges(data=True):
-        weight = data['weight']
-        width = weight / 2.0  # Scale the width
-        nx.draw_networkx_edges(
-            G, pos,
-            edgelist=[(u, v)],
-            width=width,
+    # Draw edges with varying widths based on weight; arrows stop at the
+    # edge of each node marker (radius sqrt(size) / 2 points)
+    for u, v, weight in edges:
+        ax.add_patch(FancyArrowPatch(
+            pos[u], pos[v],
+            arrowstyle='-|>',
+            mutation_scale=20,
+            linewidth=weight / 2.0,  # Scale the width
+            color="gray",
             alpha=0.7,
-            edge_color="gray",
-            arrows=True,
-            arrowsize=20,
             connectionstyle='arc3,rad=0.1',
-            ax=ax
-        )
+            shrinkA=np.sqrt(node_size[u]) / 2,
+            shrinkB=np.sqrt(node_size[v]) / 2,
+            zorder=1
+        ))
+    
+    # Leave the same room around the nodes as networkx did
+    ax.margins(0.1)
     
     # Add annotations
     ax.text(-1, 5, "Energy Flow Diagram", fontsize=18, fontweight='bold')
@@ -1,9 +1,27 @@
-import matplotlib.pyplot as plt
+import functools
+import os
 import numpy as np
-import plotly.graph_objects as go
-import networkx as nx
-import matplotlib.cm as cm
-from matplotlib.colors import to_rgba
+from concurrent.futures import ThreadPoolExecutor
+
+from jit import njit, NUMBA_AVAILABLE
+
+# matplotlib, networkx and scipy are imported inside the functions that use
+# them, so importing this module for one plot does not pay for the others
+
+@functools.lru_cache(maxsize=1)
+def _tab10_rgba():
+    """RGBA rows of the tab10 palette, one per species (cycling past ten)."""
+    import matplotlib
+    return matplotlib.colormaps['tab10'](np.arange(10))
+
+# Node colors by species type, matched on name keywords in priority order
+_SPECIES_TYPE_COLORS = (
+    ("plant", "green"), ("phyto", "green"),
+    ("herb", "blue"), ("zoo", "blue"),
+    ("carn", "red"), ("pred", "red"), ("shark", "red"),
+    ("omni", "purple"),
+    ("decomp", "brown"),
+)
 
 def plot_multi_species(times, results, species_info):
     """
@@ -17,42 +35,164 @@ def plot_multi_species(times, results, species_info):
     Returns:
         matplotlib.figure.Figure: Plot object
     """
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
+    from matplotlib.lines import Line2D
+    
     num_species = results.shape[1]
     species_names = species_info.get('names', [f"Species {i+1}" for i in range(num_species)])
     
     # Use a simple color palette for each species
-    color_palette = plt.cm.get_cmap('tab10', num_species)
+    palette = _tab10_rgba()
+    colors = palette[np.arange(num_species) % len(palette)]
     
     # Create figure and axis
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
     
-    # Plot each species
-    for i in range(num_species):
-        ax.plot(times, results[:, i], label=species_names[i], 
-                color=colors[i], linewidth=2)
+    # All species as one LineCollection: segments of shape (species, time points, 2).
+    # Past two points per horizontal pixel the extra vertices cannot be seen,
+    # so long runs are reduced to each bucket's minimum and maximum
+    times = np.asarray(times)
+    results = np.asarray(results)
+    max_points = int(fig.get_size_inches()[0] * fig.dpi * 2)
+    if len(times) > max_points:
+        segments = _minmax_segments(times, results, max_points // 2)
+    else:
+        segments = np.stack([np.broadcast_to(times, (num_species, len(times))), results.T], axis=-1)
+    ax.add_collection(LineCollection(segments, colors=colors, linewidths=2))
+    ax.autoscale_view()
     
-    # Add labels and legend
+    # Add labels and legend (proxy handles, as the collection is a single artist)
     ax.set_xlabel('Time')
     ax.set_ylabel('Population')
     ax.set_title(f'Multi-Species Population Dynamics: {species_info.get("ecosystem_type", "Ecosystem")}')
-    ax.legend(loc='upper right')
+    ax.legend(handles=[Line2D([], [], color=colors[i], linewidth=2, label=species_names[i])
+                       for i in range(num_species)],
+              loc='upper right')
     ax.grid(True, alpha=0.3)
     
     return fig
 
-def plot_food_web(species_info):
+def _minmax_segments(times, results, n_buckets):
     """
-    Create a network visualization of a multi-species food web.
+    Reduce each species' series to the minimum and maximum of every time
+    bucket, in time order, so peaks and troughs survive the decimation.
     
     Args:
-        species_info (dict): Dictionary with species interaction data
+        times (array): Time points
+        results (array): Population values, shape (time points, species)
+        n_buckets (int): Number of time buckets
         
     Returns:
-        matplotlib.figure.Figure: Network visualization
+        ndarray: Line segments of shape (species, 2 * n_buckets, 2)
     """
-    species_names = species_info['names']
-    interaction_matrix = species_info['interaction_matrix']
-    num_species = len(species_names)
+    num_points, num_species = results.shape
+    bucket = -(-num_points // n_buckets)
+    
+    # Pad the tail with the last value so the series splits into equal buckets
+    series = results.T
+    padded = np.pad(series, ((0, 0), (0, bucket * n_buckets - num_points)), mode='edge')
+    padded = padded.reshape(num_species, n_buckets, bucket)
+    
+    starts = np.arange(n_buckets) * bucket
+    idx = np.concatenate([padded.argmin(axis=2) + starts, padded.argmax(axis=2) + starts], axis=1)
+    idx = np.minimum(np.sort(idx, axis=1), num_points - 1)
+    
+    return np.stack([times[idx], np.take_along_axis(series, idx, axis=1)], axis=-1)
+
+@njit(cache=True)
+def _classify_edges(M):
+    """
+    Scan an interaction matrix once for its off-diagonal interactions.
+    
+    A negative coefficient M[i, j] means i is eaten by j (predation), a
+    positive one means cooperation or benefit.
+    
+    Args:
+        M (ndarray): Square float64 interaction matrix
+        
+    Returns:
+        tuple: (rows, cols, weights, is_predation) arrays in row-major order,
+            weights being the absolute coefficients
+    """
+    n = M.shape[0]
+    rows = np.empty(n * n, np.int64)
+    cols = np.empty(n * n, np.int64)
+    weights = np.empty(n * n, np.float64)
+    is_predation = np.empty(n * n, np.bool_)
+    
+    k = 0
+    for i in range(n):
+        for j in range(n):
+            value = M[i, j]
+            if i != j and value != 0:
+                rows[k] = i
+                cols[k] = j
+                weights[k] = abs(value)
+                is_predation[k] = value < 0
+                k += 1
+    
+    return rows[:k], cols[:k], weights[:k], is_predation[:k]
+
+if not NUMBA_AVAILABLE:
+    def _classify_edges(M):
+        """
+        NumPy version of the scan above, used without Numba, where the
+        double loop would run as interpreted Python.
+        
+        Args:
+            M (ndarray): Square float64 interaction matrix
+            
+        Returns:
+            tuple: (rows, cols, weights, is_predation) arrays in row-major order,
+                weights being the absolute coefficients
+        """
+        rows, cols = np.nonzero((M != 0) & ~np.eye(M.shape[0], dtype=bool))
+        values = M[rows, cols]
+        return rows.astype(np.int64), cols.astype(np.int64), np.abs(values), values < 0
+
+def _interaction_edges(interaction_matrix):
+    """
+    Off-diagonal interactions of a dense or scipy.sparse interaction matrix.
+    
+    Sparse matrices are read from their stored entries only, so large food
+    webs where each species interacts with a handful of others never get
+    densified.
+    
+    Args:
+        interaction_matrix (array or sparse matrix): Square interaction matrix
+        
+    Returns:
+        tuple: (rows, cols, weights, is_predation) arrays in row-major order,
+            as from _classify_edges
+    """
+    from scipy import sparse
+    
+    if not sparse.issparse(interaction_matrix):
+        return _classify_edges(np.ascontiguousarray(interaction_matrix, dtype=np.float64))
+    
+    # Canonical CSR stores each row's entries once, sorted by column
+    csr = sparse.csr_array(interaction_matrix, dtype=np.float64)
+    csr.sum_duplicates()
+    coo = csr.tocoo()
+    keep = (coo.row != coo.col) & (coo.data != 0)
+    values = coo.data[keep]
+    return (coo.row[keep].astype(np.int64), coo.col[keep].astype(np.int64),
+            np.abs(values), values < 0)
+
+def _food_web_graph(species_names, edges):
+    """
+    Build the directed food web graph from its interactions.
+    
+    Args:
+        species_names (list): Species names, in matrix order
+        edges (tuple): (rows, cols, weights, is_predation) from _interaction_edges
+        
+    Returns:
+        networkx.DiGraph: Graph with predation and benefit edges
+    """
+    import networkx as nx
     
     # Create directed graph
     G = nx.DiGraph()
@@ -62,82 +202,203 @@ def plot_food_web(species_info):
         G.add_node(name, index=i)
     
     # Add edges based on interactions
-    for i in range(num_species):
-        for j in range(num_species):
-            if i != j and interaction_matrix[i][j] != 0:
-                # Negative interaction means i is eaten by j
-                if interaction_matrix[i][j] < 0:
-                    G.add_edge(species_names[i], species_names[j], 
-                              weight=abs(interaction_matrix[i][j]),
-                              interaction_type="predation")
-                # Positive interaction means cooperation or benefit
-                elif interaction_matrix[i][j] > 0:
-                    G.add_edge(species_names[i], species_names[j], 
-                              weight=interaction_matrix[i][j],
-                              interaction_type="benefit")
-    
-    # Create positions - try to arrange in a food chain/web hierarchy
+    rows, cols, weights, is_predation = edges
+    G.add_edges_from(
+        (species_names[i], species_names[j],
+         {'weight': w, 'interaction_type': "predation" if predation else "benefit"})
+        for i, j, w, predation in zip(rows.tolist(), cols.tolist(), weights.tolist(), is_predation.tolist())
+    )
+    
+    return G
+
+def _fr_lbfgs_layout(G, dim=2, seed=42, gravity=1.0):
+    """
+    Fruchterman-Reingold layout found by minimizing the FR energy with
+    L-BFGS rather than by stepping the force simulation.
+    
+    Edges pull with energy w*d^3/(3k), every pair repels with -k^2*log(d),
+    and a weak pull towards the centroid keeps disconnected species close.
+    
+    Args:
+        G (networkx.Graph): Graph to lay out, edge weights in 'weight'
+        dim (int): Number of layout dimensions
+        seed (int): Seed for the random initial positions
+        gravity (float): Strength of the pull towards the centroid
+        
+    Returns:
+        dict: Node positions scaled to [-1, 1], like nx.spring_layout
+    """
+    import networkx as nx
+    from scipy.optimize import minimize
+    
+    nodes = list(G.nodes())
+    num_nodes = len(nodes)
+    if num_nodes == 0:
+        return {}
+    if num_nodes == 1:
+        return {nodes[0]: np.zeros(dim)}
+    
+    A = nx.to_numpy_array(G, nodelist=nodes, weight='weight')
+    A = A + A.T
+    k = 1.0 / np.sqrt(num_nodes)
+    off_diagonal = ~np.eye(num_nodes, dtype=bool)
+    
+    def energy(flat):
+        x = flat.reshape(num_nodes, dim)
+        delta = x[:, None, :] - x[None, :, :]
+        distance = np.sqrt((delta ** 2).sum(axis=-1))
+        distance[~off_diagonal] = 1.0
+        distance = np.maximum(distance, 1e-9)
+        centered = x - x.mean(axis=0)
+        
+        value = (0.5 * np.sum(A * distance ** 3) / (3 * k)
+                 - 0.5 * k ** 2 * np.sum(np.log(distance[off_diagonal]))
+                 + 0.5 * gravity * np.sum(centered ** 2))
+        coefficient = A * distance / k - np.where(off_diagonal, k ** 2 / distance ** 2, 0.0)
+        gradient = np.einsum('ij,ijd->id', coefficient, delta) + gravity * centered
+        return value, gradient.ravel()
+    
+    x0 = np.random.default_rng(seed).random((num_nodes, dim))
+    result = minimize(energy, x0.ravel(), jac=True, method='L-BFGS-B', options={'maxiter': 100})
+    positions = nx.rescale_layout(result.x.reshape(num_nodes, dim), scale=1)
+    return {name: positions[i] for i, name in enumerate(nodes)}
+
+@functools.lru_cache(maxsize=32)
+def _food_web_layout(species_names, edge_bytes):
+    """
+    Node positions for a food web, memoized on its (hashable) species names
+    and the raw bytes of its interaction arrays.
+    
+    Args:
+        species_names (tuple): Species names, in matrix order
+        edge_bytes (tuple): Bytes of the rows, cols, weights and is_predation
+            arrays from _interaction_edges
+        
+    Returns:
+        tuple: (name, x, y) for every species
+    """
+    import networkx as nx
+    
+    edges = tuple(np.frombuffer(data, dtype=dtype)
+                  for data, dtype in zip(edge_bytes, (np.int64, np.int64, np.float64, np.bool_)))
+    G = _food_web_graph(species_names, edges)
+    
+    # Try to arrange in a food chain/web hierarchy
     try:
-        # Try to use hierarchical layout
-        pos = nx.spring_layout(G, seed=42)
+        # Try to use the force-directed layout
+        pos = _fr_lbfgs_layout(G, seed=42)
     except:
         # Fall back to circular layout
         pos = nx.circular_layout(G)
     
+    return tuple((name, float(x), float(y)) for name, (x, y) in pos.items())
+
+@functools.lru_cache(maxsize=1)
+def _food_web_legend():
+    """
+    Legend proxy artists and labels for the food web plot, built once.
+    
+    Returns:
+        tuple: (handles, labels)
+    """
+    from matplotlib.lines import Line2D
+    
+    handles = [
+        Line2D([], [], color='red', linestyle='-', linewidth=2),
+        Line2D([], [], color='green', linestyle='--', linewidth=2),
+    ]
+    handles += [Line2D([], [], color=color, linestyle='none', marker='o', markersize=10)
+                for color in ('green', 'blue', 'red', 'purple', 'brown')]
+    labels = ['Predation', 'Benefit', 'Producers', 'Herbivores', 'Carnivores', 'Omnivores', 'Decomposers']
+    return handles, labels
+
+def plot_food_web(species_info):
+    """
+    Create a network visualization of a multi-species food web.
+    
+    Args:
+        species_info (dict): Dictionary with species interaction data
+        
+    Returns:
+        matplotlib.figure.Figure: Network visualization
+    """
+    import networkx as nx
+    from matplotlib.figure import Figure
+    
+    species_names = species_info['names']
+    interaction_matrix = species_info['interaction_matrix']
+    
+    edges = _interaction_edges(interaction_matrix)
+    G = _food_web_graph(species_names, edges)
+    
+    # Create positions; the layout only depends on the species and their
+    # interactions, so identical food webs reuse the cached solve
+    edge_bytes = tuple(np.ascontiguousarray(array).tobytes() for array in edges)
+    pos = {name: (x, y) for name, x, y in _food_web_layout(tuple(species_names), edge_bytes)}
+    
     # Create figure
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig = Figure(figsize=(10, 8), dpi=120)
+    ax = fig.subplots()
     
     # Draw nodes with different colors for different species types
     node_colors = []
     for node in G.nodes():
-        if "plant" in node.lower() or "phyto" in node.lower():
-            node_colors.append("green")
-        elif "herb" in node.lower() or "zoo" in node.lower():
-            node_colors.append("blue")
-        elif "carn" in node.lower() or "pred" in node.lower() or "shark" in node.lower():
-            node_colors.append("red")
-        elif "omni" in node.lower():
-            node_colors.append("purple")
-        elif "decomp" in node.lower():
-            node_colors.append("brown")
-        else:
-            node_colors.append("grey")
+        lowered = node.lower()
+        node_colors.append(next((color for keyword, color in _SPECIES_TYPE_COLORS if keyword in lowered), "grey"))
     
     # Draw nodes
-    nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=800, alpha=0.8)
+    nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=800, alpha=0.8, ax=ax)
     
     # Draw node labels
-    nx.draw_networkx_labels(G, pos, font_size=10, font_weight="bold")
+    nx.draw_networkx_labels(G, pos, font_size=10, font_weight="bold", ax=ax)
     
-    # Draw edges with different styles for predation vs. benefit
-    predation_edges = [(u, v) for u, v, d in G.edges(data=True) if d['interaction_type'] == "predation"]
-    benefit_edges = [(u, v) for u, v, d in G.edges(data=True) if d['interaction_type'] == "benefit"]
+    # Draw edges with different styles for predation vs. benefit, in the
+    # same row-major order as the graph
+    rows, cols, weights, is_predation = edges
+    edges = [(species_names[i], species_names[j]) for i, j in zip(rows.tolist(), cols.tolist())]
+    predation_edges = [edge for edge, predation in zip(edges, is_predation.tolist()) if predation]
+    benefit_edges = [edge for edge, predation in zip(edges, is_predation.tolist()) if not predation]
     
     # Edge weights for thickness
-    predation_weights = [3 * G[u][v]['weight'] for u, v in predation_edges]
-    benefit_weights = [3 * G[u][v]['weight'] for u, v in benefit_edges]
+    predation_weights = (3.0 * weights[is_predation]).tolist()
+    benefit_weights = (3.0 * weights[~is_predation]).tolist()
     
     # Draw predation edges (what eats what)
     nx.draw_networkx_edges(G, pos, edgelist=predation_edges, width=predation_weights,
-                          edge_color='red', arrows=True, connectionstyle='arc3,rad=0.1')
+                          edge_color='red', arrows=True, connectionstyle='arc3,rad=0.1', ax=ax)
     
     # Draw benefit edges (who benefits from whom)
     nx.draw_networkx_edges(G, pos, edgelist=benefit_edges, width=benefit_weights,
                           edge_color='green', style='dashed', arrows=True, 
-                          connectionstyle='arc3,rad=-0.1')
-    
-    # Add legend elements
-    ax.plot([], [], 'red-', linewidth=2, label='Predation')
-    ax.plot([], [], 'green--', linewidth=2, label='Benefit')
-    ax.plot([], [], 'o', color='green', markersize=10, label='Producers')
-    ax.plot([], [], 'o', color='blue', markersize=10, label='Herbivores')
-    ax.plot([], [], 'o', color='red', markersize=10, label='Carnivores')
-    ax.plot([], [], 'o', color='purple', markersize=10, label='Omnivores')
-    ax.plot([], [], 'o', color='brown', markersize=10, label='Decomposers')
+                          connectionstyle='arc3,rad=-0.1', ax=ax)
     
     # Add title and legend
-    plt.title(f"Food Web: {species_info.get('ecosystem_type', 'Ecosystem')}")
-    plt.legend(loc='upper right', bbox_to_anchor=(1.15, 1))
-    plt.axis('off')
+    ax.set_title(f"Food Web: {species_info.get('ecosystem_type', 'Ecosystem')}")
+    ax.legend(*_food_web_legend(), loc='upper right', bbox_to_anchor=(1.15, 1))
+    ax.set_axis_off()
+    
+    return fig
+
+@functools.lru_cache(maxsize=1)
+def _render_pool():
+    """Shared worker threads for plot_food_web_async, created on first use."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count())
+
+def plot_food_web_async(species_info, executor=None):
+    """
+    Render a food web on a background thread, for callers drawing many.
     
-    return fig
\ No newline at end of file
+    Each figure is created and drawn entirely inside its worker, so renders
+    share no matplotlib state and overlap wherever the layout solve and Agg
+    release the GIL.
+    
+    Args:
+        species_info (dict): Dictionary with species interaction data
+        executor (concurrent.futures.Executor, optional): Executor to render
+            on, owned (and shut down) by the caller. Defaults to a shared
+            thread pool created on the first call.
+        
+    Returns:
+        concurrent.futures.Future: Resolves to the plot_food_web figure
+    """
+    return (executor or _render_pool()).submit(plot_food_web, species_info)